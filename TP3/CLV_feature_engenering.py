@@ -1,5 +1,11 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from commun.cache import charger_factures_cache
+from commun.clv import agreger_clients, sequences_achats
 
 # --- 0. RÉCUPÉRATION DES DONNÉES DE L'ÉTAPE 1 ---
 # On part du principe que df_observation est déjà chargé et prêt
@@ -8,28 +14,19 @@ snapshot_date = pd.to_datetime('2010-12-31') # Remplacez par votre vraie date de
 
 # On s'assure des formats
 df_observation['invoice_date'] = pd.to_datetime(df_observation['invoice_date'])
-df_observation['invoice_month'] = df_observation['invoice_date'].dt.to_period('M')
-df_observation['is_peak_season'] = df_observation['invoice_date'].dt.month.isin([11, 12]).astype(int)
 
 # --- 1. AGRÉGATION DE BASE (RFM + Temporel + Géo) ---
-features = df_observation.groupby('customer_id').agg(
-    # RFM (Base)
-    last_purchase=('invoice_date', 'max'),
-    frequency=('invoice_id', 'nunique'),
-    monetary=('line_total', 'sum'),
-    
-    # Comportemental
-    unique_products=('product_code', 'nunique'), # Remplace les catégories si non disponibles
-    total_items=('quantity', 'sum'),
-    peak_season_purchases=('is_peak_season', 'sum'),
-    
-    # Temporel
-    first_purchase=('invoice_date', 'min'),
-    active_months=('invoice_month', 'nunique'),
-    
-    # Géographique
-    country=('country', 'first') # On prend le pays principal du client
-).reset_index()
+# Un tri par client puis des réductions numpy par client (commun/clv.py) :
+#   RFM (Base)      : last_purchase, frequency (factures distinctes), monetary
+#   Comportemental  : unique_products (remplace les catégories si non disponibles), total_items,
+#                     peak_season_purchases (articles achetés en novembre / décembre)
+#   Temporel        : first_purchase, active_months (mois distincts avec achat)
+#   Géographique    : country (le pays principal du client : le premier renseigné)
+# Les agrégats à la facture viennent de la table des factures (une ligne par facture),
+# construite une fois par fichier de transactions et relue depuis le cache
+df_orders = charger_factures_cache(chemin='transactions.csv')
+df_orders = df_orders[df_orders['invoice_date'] <= snapshot_date]
+features = agreger_clients(df_observation, df_orders)
 
 
 # --- 2. CALCUL DES FEATURES COMPLEXES DERIVÉES ---
@@ -52,36 +49,17 @@ features['peak_season_prop'] = features['peak_season_purchases'] / features['tot
 features['peak_season_prop'] = features['peak_season_prop'].fillna(0)
 
 
-# --- 3. CALCUL DE LA RÉGULARITÉ (Écart-type des délais inter-achats) ---
-# On trie les transactions par client et par date
-df_sorted = df_observation.drop_duplicates(subset=['customer_id', 'invoice_id']).sort_values(['customer_id', 'invoice_date'])
-
-# On calcule la différence en jours entre chaque commande
-df_sorted['days_since_prior_order'] = df_sorted.groupby('customer_id')['invoice_date'].diff().dt.days
-
-# On calcule l'écart-type de ce délai pour chaque client (régularité)
-regularity = df_sorted.groupby('customer_id')['days_since_prior_order'].std().reset_index()
-regularity.rename(columns={'days_since_prior_order': 'purchase_regularity_std'}, inplace=True)
-
-# S'il n'a qu'une commande, ou des commandes le même jour, l'écart-type est nul (on remplit par 0)
-regularity['purchase_regularity_std'] = regularity['purchase_regularity_std'].fillna(0)
-
-# On fusionne avec la table principale
-features = pd.merge(features, regularity, on='customer_id', how='left')
-
-
-# --- 4. CALCUL DE LA TENDANCE DU MONTANT (Dépense de + en + ou de - en - ?) ---
-# Simplification : Comparaison du panier moyen du dernier mois d'activité vs panier moyen historique
-# On récupère la dernière commande de chaque client
-last_orders = df_sorted.groupby('customer_id').tail(1)[['customer_id', 'line_total']]
-last_orders.rename(columns={'line_total': 'last_order_value'}, inplace=True)
-
-features = pd.merge(features, last_orders, on='customer_id', how='left')
+# --- 3 & 4. RÉGULARITÉ ET TENDANCE DU MONTANT (séquence des factures de chaque client) ---
+# Même table des factures (période d'observation seulement)
 
-# Tendance = Valeur de la dernière commande / Panier moyen historique
-# > 1 : En croissance (dépense plus qu'avant) | < 1 : En décroissance (dépense moins qu'avant)
-features['spending_trend_ratio'] = features['last_order_value'] / features['avg_basket']
-features['spending_trend_ratio'] = features['spending_trend_ratio'].fillna(1) # Si 1 seule commande, ratio = 1 (stable)
+# En un passage (commun/clv.py) :
+#   purchase_regularity_std : écart-type des délais inter-achats (0 s'il n'y a pas au moins 2 délais)
+#   last_order_value        : montant de la dernière commande
+#   spending_trend_ratio    : dernière commande / panier moyen historique
+#                             > 1 : En croissance (dépense plus qu'avant) | < 1 : En décroissance
+#                             (1 seule commande : ratio = 1, stable)
+sequences = sequences_achats(df_orders)
+features = pd.merge(features, sequences.drop(columns='avg_days_between_orders'), on='customer_id', how='left')
 
 
 # --- 5. ENCODAGE GÉOGRAPHIQUE (One-Hot Encoding des Top Pays) ---
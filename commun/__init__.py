@@ -0,0 +1 @@
+# Briques partagées par les scripts des TP (chargement, nettoyage, ...)
@@ -0,0 +1,3 @@
+from commun.cli import main
+
+main()
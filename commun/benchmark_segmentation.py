@@ -0,0 +1,63 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from commun.rfm import cols_rfm, noms_rfm
+from commun.segmentation import ModeleSegmentation
+
+# --- BANC D'ESSAI : K-MEANS COMPLET CONTRE K-MEANS EN FLUX ---
+#   python -m commun.benchmark_segmentation --clients customers.csv --taille 1000000 2000000
+# La base réelle est rééchantillonnée (avec un léger bruit) jusqu'à ``taille`` clients ;
+# les deux modèles sont comparés sur la même inertie (distances au carré dans l'espace
+# standardisé du modèle complet) et sur la part de clients placés dans le même cluster.
+
+
+def base_synthetique(df_rfm, taille, graine=0):
+    rng = np.random.default_rng(graine)
+    df = df_rfm.iloc[rng.integers(0, len(df_rfm), taille)].reset_index(drop=True)
+    bruit = rng.normal(1.0, 0.05, size=(taille, len(cols_rfm)))
+    return (df[cols_rfm].astype(np.float64) * bruit).clip(lower=0)
+
+
+def inertie(modele, reference, df):
+    # Centres du modèle ramenés dans l'espace standardisé de ``reference``
+    centres = (modele.centres * modele.ecarts + modele.moyennes - reference.moyennes) / reference.ecarts
+    X = reference.standardiser(df)
+    distances = (X ** 2).sum(axis=1)[:, None] - 2 * X @ centres.T + (centres ** 2).sum(axis=1)
+    return float(distances.min(axis=1).sum())
+
+
+def comparer(df, taille_bloc=100_000):
+    def blocs():
+        return (df.iloc[debut:debut + taille_bloc] for debut in range(0, len(df), taille_bloc))
+
+    debut = time.perf_counter()
+    complet = ModeleSegmentation.ajuster(df)
+    duree_complet = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    flux = ModeleSegmentation.ajuster_en_flux(blocs)
+    duree_flux = time.perf_counter() - debut
+
+    accord = np.mean(complet.predire(complet.standardiser(df)) == flux.predire(flux.standardiser(df)))
+    return {'clients': len(df),
+            'duree_complet': duree_complet, 'duree_flux': duree_flux,
+            'inertie_complet': inertie(complet, complet, df), 'inertie_flux': inertie(flux, complet, df),
+            'accord': accord}
+
+
+if __name__ == '__main__':
+    from commun.cache import charger_clients_cache
+
+    parser = argparse.ArgumentParser(description="K-Means complet (n_init=10) contre K-Means en flux (mini-lots).")
+    parser.add_argument('--clients', default='customers.csv')
+    parser.add_argument('--taille', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    df_rfm = charger_clients_cache(list(noms_rfm), chemin=args.clients).rename(columns=noms_rfm).dropna()
+    resultats = pd.DataFrame([comparer(base_synthetique(df_rfm, taille)) for taille in args.taille])
+    resultats['ecart_inertie_%'] = (resultats['inertie_flux'] / resultats['inertie_complet'] - 1) * 100
+    resultats['accord_%'] = resultats.pop('accord') * 100
+    print(resultats.round(2).to_string(index=False))
@@ -0,0 +1,68 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from commun.clv import sequences_achats
+
+# --- BANC D'ESSAI : FEATURES DE SÉQUENCE, CHAÎNE PANDAS CONTRE UN PASSAGE NUMPY ---
+#   python -m commun.benchmark_sequences --transactions transactions.csv --facteur 1 10 100
+# La table des factures réelle est recopiée ``facteur`` fois (identifiants clients décalés :
+# plus de clients, même profil d'achat). La chaîne pandas est celle de
+# TP3/CLV_feature_engenering.py (étapes 3 et 4) et du notebook TP4 (délai moyen).
+
+
+def base_synthetique(factures, facteur):
+    decalage = int(factures['customer_id'].max()) + 1
+    copies = [factures.assign(customer_id=factures['customer_id'].astype(np.int64) + i * decalage)
+              for i in range(facteur)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def chaine_pandas(factures):
+    df_sorted = factures.drop_duplicates(subset=['customer_id', 'invoice_id']).sort_values(['customer_id', 'invoice_date'])
+    df_sorted['days_since_prior_order'] = df_sorted.groupby('customer_id')['invoice_date'].diff().dt.days
+
+    regularity = df_sorted.groupby('customer_id')['days_since_prior_order'].agg(['std', 'mean']).reset_index()
+    regularity.columns = ['customer_id', 'purchase_regularity_std', 'avg_days_between_orders']
+    regularity['purchase_regularity_std'] = regularity['purchase_regularity_std'].fillna(0)
+
+    last_orders = df_sorted.groupby('customer_id').tail(1)[['customer_id', 'invoice_total']]
+    last_orders = last_orders.rename(columns={'invoice_total': 'last_order_value'})
+    avg_basket = df_sorted.groupby('customer_id')['invoice_total'].mean().rename('avg_basket').reset_index()
+
+    features = regularity.merge(last_orders, on='customer_id').merge(avg_basket, on='customer_id')
+    features['spending_trend_ratio'] = (features['last_order_value'] / features['avg_basket']).fillna(1)
+    return features.drop(columns='avg_basket')
+
+
+def comparer(factures, repetitions=3):
+    durees = {}
+    for nom, fonction in [('pandas', chaine_pandas), ('numpy', sequences_achats)]:
+        meilleure = np.inf
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            resultat = fonction(factures)
+            meilleure = min(meilleure, time.perf_counter() - debut)
+        durees[nom] = (meilleure, resultat)
+
+    (duree_pandas, attendu), (duree_numpy, obtenu) = durees['pandas'], durees['numpy']
+    ecart = max(np.nanmax(np.abs(attendu[col].to_numpy(np.float64) - obtenu[col].to_numpy(np.float64)), initial=0)
+                for col in attendu.columns if col != 'customer_id')
+    return {'factures': len(factures), 'clients': len(obtenu),
+            'duree_pandas': duree_pandas, 'duree_numpy': duree_numpy,
+            'acceleration': duree_pandas / duree_numpy, 'ecart_max': ecart}
+
+
+if __name__ == '__main__':
+    from commun.cache import charger_factures_cache
+
+    parser = argparse.ArgumentParser(description="Features de séquence : chaîne pandas contre un passage numpy.")
+    parser.add_argument('--transactions', default='transactions.csv')
+    parser.add_argument('--facteur', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+
+    factures = charger_factures_cache(chemin=args.transactions)
+    resultats = pd.DataFrame([comparer(base_synthetique(factures, facteur)) for facteur in args.facteur])
+    print(resultats.round(4).to_string(index=False))
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from commun.nettoyage import charger_clients, TAILLE_BLOC
+from commun.transactions import charger_transactions, construire_factures
+
+# Parquet (via pyarrow) permet de ne relire que les colonnes demandées.
+# Sans pyarrow, on se rabat sur un pickle : typé, mais relu en entier.
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+VERSION_CACHE = 2
+
+
+def empreinte_fichier(chemin, taille_lecture=1 << 20):
+    """Empreinte (blake2b) du contenu d'un fichier, lu par morceaux de ``taille_lecture`` octets."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(chemin, 'rb') as f:
+        for morceau in iter(lambda: f.read(taille_lecture), b''):
+            h.update(morceau)
+    return h.hexdigest()
+
+
+def _chemins_cache(chemin_source, dossier_cache, nom):
+    if dossier_cache is None:
+        dossier_cache = os.path.join(os.path.dirname(os.path.abspath(chemin_source)), '.cache')
+    extension = '.parquet' if HAS_PYARROW else '.pkl'
+    return os.path.join(dossier_cache, nom + extension), os.path.join(dossier_cache, nom + '.meta.json')
+
+
+def _lire_meta(chemin_meta):
+    try:
+        with open(chemin_meta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cache_a_jour(chemin_source, chemin_meta, meta=None):
+    """Vrai si le cache décrit par ``chemin_meta`` correspond au contenu actuel de la source.
+
+    La taille et la date de modification servent de test rapide ; le contenu n'est
+    re-hashé que si elles ont changé (fichier touché mais identique, copie, ...).
+    """
+    if meta is None:
+        meta = _lire_meta(chemin_meta)
+    if meta is None or meta.get('version') != VERSION_CACHE:
+        return False
+
+    stat = os.stat(chemin_source)
+    if meta['taille'] != stat.st_size:
+        return False
+    if meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    if meta['empreinte'] != empreinte_fichier(chemin_source):
+        return False
+
+    # Contenu identique : on mémorise la nouvelle date pour éviter de re-hasher
+    meta['mtime_ns'] = stat.st_mtime_ns
+    with open(chemin_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return True
+
+
+def ecrire_cache(df, chemin_source, chemin_donnees, chemin_meta):
+    """Écrit ``df`` dans le cache binaire et enregistre l'empreinte de la source."""
+    os.makedirs(os.path.dirname(chemin_donnees), exist_ok=True)
+    if HAS_PYARROW:
+        df.to_parquet(chemin_donnees, index=False)
+    else:
+        df.to_pickle(chemin_donnees)
+
+    stat = os.stat(chemin_source)
+    meta = {
+        'version': VERSION_CACHE,
+        'source': os.path.abspath(chemin_source),
+        'taille': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'empreinte': empreinte_fichier(chemin_source),
+        'colonnes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+    with open(chemin_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+def lire_cache(chemin_donnees, colonnes=None):
+    if HAS_PYARROW:
+        return pd.read_parquet(chemin_donnees, columns=colonnes)
+    df = pd.read_pickle(chemin_donnees)
+    return df if colonnes is None else df[colonnes]
+
+
+def charger_clients_cache(colonnes=None, chemin='customers.csv', dossier_cache=None):
+    """Table clients nettoyée (sortie de l'étape TP1), servie depuis le cache binaire.
+
+    Le cache est reconstruit uniquement si le contenu de ``chemin`` a changé.
+    ``colonnes`` limite la lecture aux colonnes utiles au script appelant.
+    """
+    chemin_donnees, chemin_meta = _chemins_cache(chemin, dossier_cache, 'customers_cleaned_final')
+
+    if not (os.path.exists(chemin_donnees) and cache_a_jour(chemin, chemin_meta)):
+        df = charger_clients(chemin)
+        ecrire_cache(df, chemin, chemin_donnees, chemin_meta)
+        return df if colonnes is None else df[colonnes].copy()
+
+    return lire_cache(chemin_donnees, colonnes)
+
+
+def charger_factures_cache(colonnes=None, chemin='transactions.csv', dossier_cache=None):
+    """Table des factures (une ligne par facture, voir commun.transactions.construire_factures),
+    servie depuis le cache binaire.
+
+    Elle n'est reconstruite, à partir des lignes de ``chemin``, que si son contenu a changé.
+    """
+    chemin_donnees, chemin_meta = _chemins_cache(chemin, dossier_cache, 'factures')
+
+    if not (os.path.exists(chemin_donnees) and cache_a_jour(chemin, chemin_meta)):
+        df_trans = charger_transactions(chemin, colonnes=['invoice_id', 'customer_id', 'quantity',
+                                                          'unit_price', 'invoice_date'])
+        df = construire_factures(df_trans)
+        ecrire_cache(df, chemin, chemin_donnees, chemin_meta)
+        return df if colonnes is None else df[colonnes].copy()
+
+    return lire_cache(chemin_donnees, colonnes)
+
+
+def iterer_clients_cache(colonnes=None, chemin='customers.csv', dossier_cache=None, taille_bloc=TAILLE_BLOC):
+    """Parcourt la table clients nettoyée par blocs de ``taille_bloc`` lignes, depuis le cache.
+
+    Avec pyarrow, seuls les blocs lus sont en mémoire ; le cache est construit s'il manque.
+    """
+    chemin_donnees, chemin_meta = _chemins_cache(chemin, dossier_cache, 'customers_cleaned_final')
+    if not (os.path.exists(chemin_donnees) and cache_a_jour(chemin, chemin_meta)):
+        df = charger_clients_cache(colonnes, chemin, dossier_cache)
+    elif HAS_PYARROW:
+        import pyarrow.parquet as pq
+        for lot in pq.ParquetFile(chemin_donnees).iter_batches(batch_size=taille_bloc, columns=colonnes):
+            yield lot.to_pandas()
+        return
+    else:
+        df = lire_cache(chemin_donnees, colonnes)
+    for debut in range(0, len(df), taille_bloc):
+        yield df.iloc[debut:debut + taille_bloc]
@@ -0,0 +1,361 @@
+import argparse
+import os
+import sys
+import time
+
+# --- LIGNE DE COMMANDE UNIQUE ---
+#   python -m commun <commande> [options]      (depuis le dossier des données)
+# Seuls argparse et la bibliothèque standard sont importés au démarrage : pandas,
+# matplotlib, seaborn, sklearn, xgboost et shap ne sont chargés que par les commandes
+# qui s'en servent (target ou rfm démarrent sans sklearn ni matplotlib).
+
+
+def _arrondir(df, decimales=1):
+    # Les colonnes float32 du schéma compact s'affichent mal une fois arrondies
+    flottants = df.select_dtypes('floating').columns
+    return df.astype({col: 'float64' for col in flottants}).round(decimales)
+
+
+def commande_clean(args):
+    from commun.incremental import nettoyer_clients_incremental
+
+    bilan = nettoyer_clients_incremental(args.clients, args.sortie, chemin_rejets=args.rejets,
+                                         complet=args.complet)
+    print(f"Mode : {bilan['mode']}")
+    print(f"Lignes nouvelles : {bilan['lignes_nouvelles']}")
+    print(f"Doublons supprimés : {bilan['doublons']}")
+    for nom, n in bilan['rejets'].items():
+        print(f"Lignes en violation '{nom}' : {n}")
+    print(f"Lignes ajoutées à {args.sortie} : {bilan['lignes_finales']}")
+
+
+def commande_target(args):
+    from commun.clv import construire_cible, decouper_temporel
+    from commun.transactions import charger_transactions
+
+    df_trans = charger_transactions(args.transactions, colonnes=['customer_id', 'invoice_date', 'quantity', 'unit_price'])
+    df_observation, df_cible, snapshot_date = decouper_temporel(df_trans, args.mois)
+    df_ml_base = construire_cible(df_observation, df_cible)
+
+    print(f"Date de Snapshot (Séparation) : {snapshot_date}")
+    print(f"Nombre de clients à prédire : {len(df_ml_base)}")
+    print(f"Clients ayant racheté (Target > 0) : {int((df_ml_base['target_12m_value'] > 0).sum())}")
+    print(f"Clients inactifs (Target = 0) : {int((df_ml_base['target_12m_value'] == 0).sum())}")
+    if args.sortie:
+        df_ml_base.to_csv(args.sortie, index=False)
+        print(f"Cible sauvegardée sous '{args.sortie}'.")
+
+
+def commande_rfm(args):
+    import pandas as pd
+    from commun.rendu import Donnees
+    from commun.rfm import CubeRFM, clients_a_risque, clients_perdus
+
+    if args.partitionne:
+        return _rfm_partitionne(args)
+
+    d = Donnees(args.clients)
+    df_rfm = d.rfm
+    print(f"Clients scorés : {len(df_rfm)}\n")
+    for score, colonne in [('R_Score', 'Récence'), ('F_Score', 'Fréquence'), ('M_Score', 'Montant Total')]:
+        resume = df_rfm.groupby(score, observed=True)[colonne].agg(['count', 'min', 'mean', 'max'])
+        print(f"--- {colonne} par {score} ---")
+        print(_arrondir(resume.sort_index(ascending=False)), end='\n\n')
+
+    # Segments lus dans le cube, éventuellement ventilés par pays ou par cluster
+    if args.par == 'country':
+        cube = CubeRFM(df_rfm.join(d.clients['country']), ['country'])
+    elif args.par == 'cluster':
+        cube = CubeRFM(df_rfm.join(d.segments['Nom_Cluster']), ['Nom_Cluster'])
+    else:
+        cube = d.cube
+    for nom, regle in [('Tous', None), ('Perdus (111)', clients_perdus), ('À risque', clients_a_risque)]:
+        if args.par:
+            axe = cube.axes[-1]
+            tableau = pd.DataFrame({stat: cube.tableau(axe, 'R_Score', stat, regle).sum(axis=1)
+                                    for stat in ('effectif', 'montant')})
+        else:
+            tableau = pd.DataFrame(cube.agreger(regle), index=['Total'])[['effectif', 'montant']]
+        print(f"--- Segment : {nom} ---")
+        print(_arrondir(tableau), end='\n\n')
+
+
+def _rfm_partitionne(args):
+    # Bornes globales par résumés de quantiles fusionnés, puis scores bloc par bloc
+    from commun.cache import iterer_clients_cache
+    from commun.rfm import bornes_rfm, clients_a_risque, clients_perdus, noms_rfm, scorer_blocs
+
+    bornes = bornes_rfm(iterer_clients_cache(list(noms_rfm), chemin=args.clients), args.processus)
+    print("--- Bornes des quintiles (20/40/60/80 %) ---")
+    for colonne, valeurs in bornes.items():
+        print(f"{colonne:<14} " + "  ".join(f"{v:10.2f}" for v in valeurs))
+
+    if args.sortie and os.path.exists(args.sortie):
+        os.remove(args.sortie)
+    segments = {'Tous': [0, 0.0], 'Perdus (111)': [0, 0.0], 'À risque': [0, 0.0]}
+    blocs = iterer_clients_cache(['customer_id'] + list(noms_rfm), chemin=args.clients)
+    for bloc in scorer_blocs(blocs, bornes, args.processus):
+        for nom, masque in [('Tous', None), ('Perdus (111)', clients_perdus(bloc)),
+                            ('À risque', clients_a_risque(bloc))]:
+            selection = bloc if masque is None else bloc[masque]
+            segments[nom][0] += len(selection)
+            segments[nom][1] += float(selection['Montant Total'].sum())
+        if args.sortie:
+            bloc.to_csv(args.sortie, mode='a', header=not os.path.exists(args.sortie), index=False)
+
+    print()
+    for nom, (effectif, montant) in segments.items():
+        print(f"Segment {nom:<14} : {effectif:>9} clients  {montant:>16,.2f} €")
+    if args.sortie:
+        print(f"\nScores sauvegardés sous '{args.sortie}'.")
+
+
+def commande_refresh(args):
+    from commun.rfm_incremental import COLONNES_LOT, EtatRFM
+    from commun.transactions import charger_transactions
+
+    etat = EtatRFM.charger(args.etat)
+    lots = list(args.lots)
+    if etat is None:
+        # Premier passage : l'état est construit à partir de tout l'historique
+        etat = EtatRFM(args.tolerance)
+        lots.insert(0, args.transactions)
+    etat.tolerance = args.tolerance
+
+    for chemin in lots:
+        bilan = etat.appliquer(charger_transactions(chemin, colonnes=COLONNES_LOT))
+        print(f"{chemin} : {bilan['lignes']} lignes, {bilan['clients_touches']} clients "
+              f"({bilan['nouveaux_clients']} nouveaux), {bilan['scores_modifies']} scores modifiés, "
+              f"dérive {bilan['derive']:.3f}" + (" -> reclassement complet" if bilan['reclassement'] else ""))
+    etat.sauvegarder(args.etat)
+    print(f"Clients suivis : {etat.n} (état sauvegardé dans '{args.etat}')")
+    if args.sortie:
+        etat.table().to_csv(args.sortie, index=False)
+        print(f"Scores sauvegardés sous '{args.sortie}'.")
+
+
+def commande_cluster(args):
+    from commun.rendu import Donnees
+
+    d = Donnees(args.clients, segmentation=args.segmentation)
+    resume = d.resume_clusters
+    profil = resume.loc[resume['Effectif'] > 0, ['Effectif', 'Récence', 'Fréquence', 'Montant Total']].set_axis(
+        ['Nombre_Clients', 'Recence_Moy', 'Frequence_Moy', 'Montant_Moy'], axis=1)
+    print(_arrondir(profil))
+    if args.sortie:
+        d.segments.to_csv(args.sortie)
+        print(f"\nSegments sauvegardés sous '{args.sortie}'.")
+    if args.resume:
+        from commun.profils import ecrire_resume
+        ecrire_resume(resume, args.resume)
+        print(f"Table des segments sauvegardée sous '{args.resume}'.")
+
+
+def commande_assign(args):
+    import pandas as pd
+    from commun.rfm import noms_rfm
+    from commun.segmentation import ModeleSegmentation, assigner_clusters, noms_clusters
+
+    if args.modele:
+        modele = ModeleSegmentation.charger(args.modele)
+    else:
+        # Modèle enregistré pour la base de référence (ajusté une seule fois s'il manque)
+        from commun.rendu import Donnees
+        modele = Donnees(args.clients).modele_segmentation
+
+    if os.path.exists(args.sortie):
+        os.remove(args.sortie)
+    blocs = pd.read_csv(args.entree, usecols=lambda col: col == 'customer_id' or col in noms_rfm,
+                        dtype=str, chunksize=args.taille_bloc)
+    effectifs = {}
+    for sortie in assigner_clusters(blocs, modele):
+        for cluster, n in sortie['Cluster'].value_counts().items():
+            effectifs[cluster] = effectifs.get(cluster, 0) + n
+        sortie.to_csv(args.sortie, mode='a', header=not os.path.exists(args.sortie), index=False)
+
+    for cluster in sorted(effectifs):
+        print(f"{noms_clusters.get(cluster, 'Non classé (RFM invalide)'):<28} : {effectifs[cluster]}")
+    print(f"Segments sauvegardés sous '{args.sortie}'.")
+
+
+def commande_select_k(args):
+    from commun.nombre_clusters import dessiner_coude, evaluer_k
+    from commun.rendu import Donnees
+    from commun.rfm import cols_rfm
+
+    d = Donnees(args.clients)
+    X = d.base_rfm[cols_rfm].to_numpy(dtype='float64')
+    X = (X - X.mean(axis=0)) / X.std(axis=0)
+    tableau = evaluer_k(X, d.rfm['RFM_Code'].to_numpy(), range(args.k[0], args.k[1] + 1),
+                        args.echantillon, args.processus, args.budget)
+    print(tableau.round(3))
+
+    os.makedirs(args.dossier, exist_ok=True)
+    tableau.to_csv(os.path.join(args.dossier, 'choix_k.csv'))
+    dessiner_coude(tableau, os.path.join(args.dossier, 'choix_k_coude_colors.png'))
+    print(f"\nTableau et courbe du coude sauvegardés dans '{args.dossier}'.")
+
+
+def commande_features(args):
+    from commun.cache import charger_factures_cache
+    from commun.clv import snapshots_mensuels, table_modele, table_modele_snapshots
+    from commun.transactions import charger_transactions
+
+    df_trans = charger_transactions(args.transactions)
+    factures = charger_factures_cache(chemin=args.transactions)
+    if args.snapshots > 1:
+        # Backtest : une ligne par (client, snapshot), tous les snapshots en un passage
+        snapshots = snapshots_mensuels(df_trans, args.snapshots, args.mois)
+        df_final = table_modele_snapshots(df_trans, snapshots, args.mois, factures)
+        print(f"Snapshots : {len(snapshots)} ({snapshots[0].date()} -> {snapshots[-1].date()})")
+        print(f"Lignes (client, snapshot) : {len(df_final)}")
+        print(f"Nombre de features : {len(df_final.columns) - 3} (hors customer_id, snapshot_date et cible)")
+    else:
+        df_final = table_modele(df_trans, args.mois, factures)
+        print(f"Nombre de clients : {len(df_final)}")
+        print(f"Nombre de features : {len(df_final.columns) - 2} (hors customer_id et cible)")
+    df_final.to_csv(args.sortie, index=False)
+    print(f"Table des features sauvegardée sous '{args.sortie}'.")
+
+
+def _entrainer(args):
+    from commun.cache import charger_factures_cache
+    from commun.clv import entrainer_modeles, table_modele
+    from commun.transactions import charger_transactions
+
+    df_final = table_modele(charger_transactions(args.transactions), args.mois,
+                            charger_factures_cache(chemin=args.transactions))
+    return df_final, entrainer_modeles(df_final)
+
+
+def commande_train(args):
+    import pandas as pd
+
+    _, (_, results, _, _, _) = _entrainer(args)
+    print("--- RÉSULTATS SUR LE TEST SET ---")
+    print(pd.DataFrame(results).T.round(2))
+
+
+def commande_explain(args):
+    import numpy as np
+    import pandas as pd
+    import shap
+
+    _, (models, _, _, X_test, _) = _entrainer(args)
+    shap_values = shap.TreeExplainer(models["3. XGBoost"])(X_test)
+
+    importance = pd.Series(np.abs(shap_values.values).mean(axis=0), index=X_test.columns)
+    print("--- IMPORTANCE SHAP MOYENNE (XGBoost) ---")
+    print(importance.sort_values(ascending=False).round(2))
+
+    if args.dossier:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        os.makedirs(args.dossier, exist_ok=True)
+        plt.figure(figsize=(10, 6))
+        shap.plots.beeswarm(shap_values, show=False)
+        plt.title("Importance globale des Features sur la CLV (XGBoost)", fontsize=14, fontweight='bold', pad=20)
+        plt.tight_layout()
+        plt.savefig(os.path.join(args.dossier, 'shap_beeswarm_global.png'), bbox_inches='tight', dpi=150)
+        plt.close()
+
+
+def commande_charts(args):
+    from commun.rendu import Donnees, rendre
+
+    durees = rendre(args.graphiques or None, args.dossier, args.processus,
+                    Donnees(args.clients, args.transactions, args.nuage, args.segmentation),
+                    forcer=args.forcer)
+    for nom, duree in sorted(durees.items()):
+        print(f"{nom:<45} {duree:6.2f} s" if duree else f"{nom:<45} (inchangé)")
+
+
+def construire_parser():
+    parser = argparse.ArgumentParser(prog='python -m commun', description="Data Marketing : nettoyage, RFM, segments, CLV et graphiques.")
+    parser.add_argument('--clients', default='customers.csv')
+    parser.add_argument('--transactions', default='transactions.csv')
+    sous = parser.add_subparsers(dest='commande', required=True)
+
+    p = sous.add_parser('clean', help="nettoyage incrémental de la table clients")
+    p.add_argument('--sortie', default='customers_cleaned_final.csv')
+    p.add_argument('--rejets', default='customers_rejets.csv')
+    p.add_argument('--complet', action='store_true', help="retraite tout le fichier")
+    p.set_defaults(fonction=commande_clean)
+
+    p = sous.add_parser('target', help="split temporel et CLV cible à 12 mois")
+    p.add_argument('--mois', type=int, default=12)
+    p.add_argument('--sortie', default=None, help="CSV de la cible (facultatif)")
+    p.set_defaults(fonction=commande_target)
+
+    p = sous.add_parser('rfm', help="scores RFM par quintiles et segments (résumé)")
+    p.add_argument('--par', choices=['country', 'cluster'], default=None, help="ventilation des segments")
+    p.add_argument('--partitionne', action='store_true',
+                   help="quintiles approchés par blocs, sans charger toute la base (voir commun/rfm.py)")
+    p.add_argument('--processus', type=int, default=None)
+    p.add_argument('--sortie', default=None, help="CSV des scores, en mode partitionné (facultatif)")
+    p.set_defaults(fonction=commande_rfm)
+
+    p = sous.add_parser('refresh', help="mise à jour incrémentale des scores RFM par lots de transactions")
+    p.add_argument('lots', nargs='*', help="CSV de nouvelles transactions (format de transactions.csv)")
+    p.add_argument('--etat', default='rfm.etat', help="dossier de l'état RFM")
+    p.add_argument('--tolerance', type=float, default=0.02, help="dérive des bornes avant reclassement complet")
+    p.add_argument('--sortie', default=None, help="CSV des scores (facultatif)")
+    p.set_defaults(fonction=commande_refresh)
+
+    p = sous.add_parser('cluster', help="segments K-Means sur les variables RFM")
+    p.add_argument('--sortie', default=None, help="CSV des segments (facultatif)")
+    p.add_argument('--resume', default=None,
+                   help="table des segments : moyennes, ancienneté, pays (.csv, .parquet ou .pkl, facultatif)")
+    p.add_argument('--segmentation', choices=['complet', 'flux'], default='complet',
+                   help="ajustement K-Means (flux = mini-lots, bloc par bloc)")
+    p.set_defaults(fonction=commande_cluster)
+
+    p = sous.add_parser('assign', help="attribue un segment C0-C3 à des clients, sans réajuster K-Means")
+    p.add_argument('entree', help="CSV clients (customer_id, recency_days, n_orders, total_spent)")
+    p.add_argument('--sortie', default='clusters_clients.csv')
+    p.add_argument('--modele', default=None, help="modèle .npz (par défaut : celui de la base --clients)")
+    p.add_argument('--taille-bloc', type=int, default=100_000)
+    p.set_defaults(fonction=commande_assign)
+
+    p = sous.add_parser('select-k', help="inertie et silhouette de K-Means pour une plage de k, en parallèle")
+    p.add_argument('--k', type=int, nargs=2, default=[2, 10], metavar=('MIN', 'MAX'))
+    p.add_argument('--echantillon', type=int, default=10_000, help="taille de l'échantillon de la silhouette")
+    p.add_argument('--processus', type=int, default=None)
+    p.add_argument('--budget', type=float, default=300, help="temps maximal en secondes")
+    p.add_argument('--dossier', default='.')
+    p.set_defaults(fonction=commande_select_k)
+
+    p = sous.add_parser('features', help="table des features CLV + cible")
+    p.add_argument('--mois', type=int, default=12)
+    p.add_argument('--snapshots', type=int, default=1,
+                   help="nombre de snapshots mensuels (origine glissante) ; > 1 : table longue (client, snapshot)")
+    p.add_argument('--sortie', default='features_clv_model.csv')
+    p.set_defaults(fonction=commande_features)
+
+    p = sous.add_parser('train', help="entraînement et évaluation des modèles CLV")
+    p.add_argument('--mois', type=int, default=12)
+    p.set_defaults(fonction=commande_train)
+
+    p = sous.add_parser('explain', help="importance SHAP du modèle XGBoost")
+    p.add_argument('--mois', type=int, default=12)
+    p.add_argument('--dossier', default=None, help="dossier du graphique beeswarm (facultatif)")
+    p.set_defaults(fonction=commande_explain)
+
+    p = sous.add_parser('charts', help="génère les graphiques (un seul chargement des données)")
+    p.add_argument('graphiques', nargs='*', help="noms des PNG à générer (tous par défaut)")
+    p.add_argument('--dossier', default='.')
+    p.add_argument('--processus', type=int, default=None)
+    p.add_argument('--forcer', action='store_true')
+    p.add_argument('--nuage', choices=['auto', 'points', 'densite'], default='auto')
+    p.add_argument('--segmentation', choices=['complet', 'flux'], default='complet')
+    p.set_defaults(fonction=commande_charts)
+    return parser
+
+
+def main(argv=None):
+    args = construire_parser().parse_args(argv)
+    debut = time.perf_counter()
+    args.fonction(args)
+    print(f"[{args.commande} : {time.perf_counter() - debut:.1f} s]", file=sys.stderr)
@@ -0,0 +1,442 @@
+import numpy as np
+import pandas as pd
+
+from commun.transactions import DECIMALES_PRIX, construire_factures
+
+# --- CLV (TP3) : SPLIT TEMPOREL, CIBLE, FEATURES ET MODÈLES ---
+# Étapes partagées par les scripts TP3 et la ligne de commande (commun.cli).
+# Les bibliothèques de modélisation (sklearn, xgboost) ne sont importées que
+# par entrainer_modeles.
+
+MOIS_CIBLE = 12
+
+
+def decouper_temporel(df_trans, mois=MOIS_CIBLE):
+    """Split temporel strict autour du snapshot (``mois`` avant la dernière date).
+
+    Renvoie ``(df_observation, df_cible, snapshot_date)`` : aucune transaction de la
+    période cible ne peut servir aux features (pas de data leakage).
+    """
+    date_max = df_trans['invoice_date'].max()
+    snapshot_date = date_max - pd.DateOffset(months=mois)
+
+    df_observation = df_trans[df_trans['invoice_date'] <= snapshot_date].copy()
+    df_cible = df_trans[df_trans['invoice_date'] > snapshot_date].copy()
+    return df_observation, df_cible, snapshot_date
+
+
+def construire_cible(df_observation, df_cible):
+    """CLV de la période cible pour chaque client connu pendant l'observation.
+
+    Un client qui n'a rien acheté pendant la période cible a une CLV de 0 €.
+    """
+    clients_actifs = pd.DataFrame({'customer_id': df_observation['customer_id'].unique()})
+    target_clv = df_cible.groupby('customer_id')['line_total'].sum().reset_index()
+    target_clv.rename(columns={'line_total': 'target_12m_value'}, inplace=True)
+
+    df_ml_base = pd.merge(clients_actifs, target_clv, on='customer_id', how='left')
+    df_ml_base['target_12m_value'] = df_ml_base['target_12m_value'].fillna(0)
+    return df_ml_base
+
+
+# --- AGRÉGATS PAR CLIENT : UN TRI, PUIS DES RÉDUCTIONS PAR SEGMENT ---
+# Équivalent de groupby('customer_id').agg(...) sans table de hachage :
+#   - les clients sont codés 0..n-1 dans l'ordre des identifiants (table de correspondance
+#     quand les identifiants sont des entiers peu dispersés, tri sinon) ;
+#   - les lignes sont triées une fois par code client, par un tri stable en passes de
+#     16 bits (tri par base de numpy) : l'ordre d'origine est gardé dans chaque client ;
+#   - chaque client est alors une tranche contiguë et chaque agrégat une réduction numpy
+#     par tranche (reduceat). Les nunique comptent les couples (client, code entier)
+#     distincts : codes des catégories (produits), mois depuis 1970 pour les mois.
+# Les agrégats à la facture (dates, fréquence, montant, articles, haute saison, mois actifs)
+# sont lus dans la table des factures (commun.transactions.construire_factures, une ligne
+# par facture) ; seuls les produits distincts et le pays, qui ne sont pas des attributs de
+# la facture, viennent des lignes.
+
+MOIS_HAUTE_SAISON = (11, 12)
+PRESENCE_MAX = 2 ** 24  # taille max. du tableau client x code pour compter les distincts sans tri
+
+
+def _codes_clients(identifiants):
+    # (codes 0..n-1 dans l'ordre des identifiants, identifiants distincts triés)
+    if np.issubdtype(identifiants.dtype, np.integer) and len(identifiants):
+        minimum = int(identifiants.min())
+        etendue = int(identifiants.max()) - minimum + 1
+        if etendue <= 4 * len(identifiants):
+            decales = identifiants.astype(np.int64) - minimum
+            presents = np.bincount(decales, minlength=etendue) > 0
+            codes = (np.cumsum(presents) - 1)[decales]
+            return codes, (np.flatnonzero(presents) + minimum).astype(identifiants.dtype)
+    distincts, codes = np.unique(identifiants, return_inverse=True)
+    return codes.ravel(), distincts
+
+
+def _ordre_stable(codes, n_codes):
+    # Tri stable par passes de 16 bits (chaque passe est un tri par base)
+    ordre = np.arange(len(codes))
+    decalage = 0
+    while decalage == 0 or max(n_codes - 1, 0) >> decalage:
+        chiffres = ((codes[ordre] >> decalage) & 0xFFFF).astype(np.uint16)
+        ordre = ordre[np.argsort(chiffres, kind='stable')]
+        decalage += 16
+    return ordre
+
+
+def _distincts(groupes, codes, n_groupes):
+    # Nombre de codes distincts (>= 0, les vides valent -1) par groupe
+    valides = codes >= 0
+    groupes, codes = groupes[valides].astype(np.int64), codes[valides].astype(np.int64)
+    n_codes = int(codes.max()) + 1 if len(codes) else 1
+    couples = groupes * n_codes + codes
+    if n_groupes * n_codes < 2 ** 31:
+        couples = couples.astype(np.int32)  # tri deux fois plus rapide
+    if n_groupes * n_codes <= PRESENCE_MAX:
+        presents = np.bincount(couples, minlength=n_groupes * n_codes).reshape(n_groupes, n_codes)
+        return np.count_nonzero(presents, axis=1)
+    couples.sort()
+    premiers = np.r_[True, couples[1:] != couples[:-1]]
+    return np.bincount(couples[premiers] // n_codes, minlength=n_groupes)
+
+
+def _mois(dates):
+    # Mois depuis 1970 de chaque date : conversion calendaire sur les seuls jours de l'étendue
+    jours = dates.astype('datetime64[D]').astype(np.int64)
+    if not len(jours):
+        return jours
+    premier = jours.min()
+    calendrier = np.arange(premier, jours.max() + 1).astype('datetime64[D]').astype('datetime64[M]')
+    return calendrier.astype(np.int64)[jours - premier]
+
+
+def _codes(serie):
+    # Codes entiers d'une colonne (codes de catégorie si possible), -1 pour les vides
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy()
+    return pd.factorize(serie)[0]
+
+
+def agreger_clients(df_observation, factures=None):
+    """Agrégats de base par client, triés par customer_id (même table que le groupby d'origine) :
+    last_purchase, first_purchase, frequency, monetary, unique_products, total_items,
+    peak_season_purchases, active_months et country (premier pays renseigné).
+
+    ``factures`` : table des factures des mêmes lignes (construire_factures, par exemple relue
+    par commun.cache.charger_factures_cache), construite à partir de ``df_observation`` si absente.
+    """
+    if factures is None:
+        factures = construire_factures(df_observation)
+    codes_lignes, clients = _codes_clients(df_observation['customer_id'].to_numpy())
+    n_clients = len(clients)
+
+    # Factures : mêmes clients que les lignes, même numérotation
+    codes_factures = np.searchsorted(clients, factures['customer_id'].to_numpy())
+    ordre = _ordre_stable(codes_factures, n_clients)
+    effectifs = np.bincount(codes_factures, minlength=n_clients)
+    debuts = np.cumsum(effectifs) - effectifs
+    groupes = codes_factures[ordre]
+
+    def trie(col):
+        return factures[col].to_numpy()[ordre]
+
+    dates = trie('invoice_date')
+    mois = _mois(dates)
+    haute_saison = np.isin(mois % 12 + 1, MOIS_HAUTE_SAISON)
+
+    def somme(valeurs):
+        return np.add.reduceat(valeurs, debuts) if n_clients else valeurs[:0]
+
+    # Premier pays renseigné de chaque client (ordre d'origine des lignes), vide s'il n'y en a pas
+    pays = df_observation['country']
+    renseignees = np.flatnonzero(pays.notna().to_numpy())
+    avec_pays, premieres = np.unique(codes_lignes[renseignees], return_index=True)
+    lignes_pays = np.full(n_clients, -1)
+    lignes_pays[avec_pays] = renseignees[premieres]
+
+    return pd.DataFrame({
+        'customer_id': clients,
+        'last_purchase': np.maximum.reduceat(dates, debuts) if n_clients else dates,
+        'first_purchase': np.minimum.reduceat(dates, debuts) if n_clients else dates,
+        'frequency': effectifs,
+        'monetary': somme(trie('invoice_total').astype(np.float64)),
+        'unique_products': _distincts(codes_lignes, _codes(df_observation['product_code']), n_clients),
+        # même type que le groupby des lignes
+        'total_items': pd.array(somme(factures['n_items'].fillna(0).to_numpy(np.int64)[ordre]),
+                                dtype=df_observation['quantity'].dtype),
+        'peak_season_purchases': somme(trie('n_lines').astype(np.int64) * haute_saison),
+        'active_months': _distincts(groupes, mois - (mois.min() if n_clients else 0), n_clients),
+        'country': pays.iloc[np.maximum(lignes_pays, 0)].reset_index(drop=True).where(lignes_pays >= 0),
+    })
+
+
+# --- SÉQUENCES D'ACHATS PAR CLIENT (À LA FACTURE) ---
+# Régularité, délai moyen entre deux commandes, valeur de la dernière commande et
+# tendance, en un passage sur la table des factures (commun.transactions.construire_factures) :
+# un tri (client, date) s'il manque, les écarts en jours par np.diff, puis des réductions par client
+# (reduceat / bincount). Remplace la chaîne drop_duplicates -> sort_values ->
+# groupby().diff() -> groupby().std() -> groupby().tail(1) -> merge.
+
+JOUR = np.timedelta64(1, 'D')
+
+
+def sequences_achats(factures):
+    """Features de séquence par client, triées par customer_id :
+
+    - purchase_regularity_std : écart-type (ddof=1) des délais en jours entre deux
+      factures successives, 0 s'il y a moins de deux délais ;
+    - avg_days_between_orders : délai moyen en jours (vide avec une seule facture) ;
+    - last_order_value : montant de la dernière facture ;
+    - spending_trend_ratio : dernière facture / panier moyen (1 si le panier moyen est nul).
+    """
+    codes_clients, clients = _codes_clients(factures['customer_id'].to_numpy())
+    dates = factures['invoice_date'].to_numpy()
+    totaux = factures['invoice_total'].to_numpy(np.float64)
+    # La table des factures arrive déjà triée (client, date) : le tri n'est fait que s'il manque
+    meme_client = codes_clients[1:] == codes_clients[:-1]
+    if not np.all((codes_clients[1:] > codes_clients[:-1]) | (meme_client & (dates[1:] >= dates[:-1]))):
+        ordre = np.lexsort((dates, codes_clients))
+        codes_clients, dates, totaux = codes_clients[ordre], dates[ordre], totaux[ordre]
+    n_clients = len(clients)
+    effectifs = np.bincount(codes_clients, minlength=n_clients)
+    fins = np.cumsum(effectifs) - 1
+
+    # Délais entre factures successives du même client (jours entiers, comme .dt.days)
+    suite = codes_clients[1:] == codes_clients[:-1]
+    groupes = codes_clients[1:][suite]
+    delais = np.floor(np.diff(dates)[suite] / JOUR)
+    n_delais = np.bincount(groupes, minlength=n_clients)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moyennes = np.bincount(groupes, weights=delais, minlength=n_clients) / n_delais
+        ecarts = np.bincount(groupes, weights=(delais - moyennes[groupes]) ** 2, minlength=n_clients)
+        ecart_type = np.sqrt(ecarts / (n_delais - 1))
+        paniers = np.bincount(codes_clients, weights=totaux, minlength=n_clients) / effectifs
+        tendance = totaux[fins] / paniers
+
+    return pd.DataFrame({
+        'customer_id': clients,
+        'purchase_regularity_std': np.where(n_delais > 1, ecart_type, 0.0),
+        'avg_days_between_orders': moyennes,
+        'last_order_value': totaux[fins],
+        'spending_trend_ratio': np.where(np.isnan(tendance), 1.0, tendance),
+    })
+
+
+def construire_features(df_observation, snapshot_date, factures=None):
+    """Features par client (RFM, comportement, saisonnalité, pays) à la date du snapshot
+    (``factures`` : table des factures de ``df_observation``, voir agreger_clients)."""
+    return _deriver_features(agreger_clients(df_observation, factures), snapshot_date)
+
+
+def _deriver_features(features, snapshot_date):
+    # Features dérivées des agrégats par client (sortie de agreger_clients) ; ``snapshot_date``
+    # est une date, ou une Series (une date par ligne) pour une table à plusieurs snapshots
+    features['recency'] = (snapshot_date - features['last_purchase']).dt.days
+    features['tenure_days'] = (snapshot_date - features['first_purchase']).dt.days
+    features['avg_basket'] = features['monetary'] / features['frequency']
+    features['first_purchase_month'] = features['first_purchase'].dt.month
+    features['peak_season_prop'] = (features['peak_season_purchases'] / features['total_items']).fillna(0)
+
+    features = features.drop(columns=['last_purchase', 'first_purchase', 'peak_season_purchases'])
+
+    # Encodage du Pays (Garder le Top 3, le reste en 'Other')
+    if isinstance(snapshot_date, pd.Series):
+        # Top 3 de chaque snapshot
+        comptes = features.groupby([snapshot_date, 'country'], observed=True).size()
+        principaux = comptes.groupby(level=0, group_keys=False).nlargest(3).index
+        garder = pd.MultiIndex.from_arrays([snapshot_date, features['country']]).isin(principaux)
+        features['country_clean'] = features['country'].astype(object).where(garder, 'Other')
+    else:
+        top_countries = features['country'].value_counts().nlargest(3).index.tolist()
+        features['country_clean'] = features['country'].apply(lambda x: x if x in top_countries else 'Other')
+    country_dummies = pd.get_dummies(features['country_clean'], prefix='country')
+    return pd.concat([features.drop(columns=['country', 'country_clean']), country_dummies], axis=1)
+
+
+def table_modele(df_trans, mois=MOIS_CIBLE, factures=None):
+    """Table prête pour la modélisation : features + ``target_12m_value`` par client.
+
+    ``factures`` : table des factures de ``df_trans`` (commun.cache.charger_factures_cache),
+    construite sur la période d'observation si absente.
+    """
+    df_observation, df_cible, snapshot_date = decouper_temporel(df_trans, mois)
+    if factures is not None:
+        factures = factures[factures['invoice_date'] <= snapshot_date]
+    features = construire_features(df_observation, snapshot_date, factures)
+    df_ml_base = construire_cible(df_observation, df_cible)
+
+    df_final = pd.merge(features, df_ml_base[['customer_id', 'target_12m_value']], on='customer_id', how='inner')
+    # Infinis (division par zéro) -> vide, puis tous les vides à 0
+    return df_final.replace([np.inf, -np.inf], np.nan).fillna(0)
+
+
+# --- PLUSIEURS SNAPSHOTS (ORIGINE GLISSANTE) EN UN PASSAGE ---
+# Backtest sur plusieurs dates de snapshot sans relancer le pipeline à chaque date : les
+# factures et les lignes sont triées une fois par (client, date), chaque agrégat devient
+# une somme cumulée sur ce tri (factures : compteurs, montants, premières apparitions de
+# chaque mois du client ; lignes : premières apparitions de chaque produit, et pour le pays
+# minimum cumulé de la position dans le fichier), et chaque snapshot n'est plus que des
+# points de coupe par client (searchsorted) : fin de l'observation et fin de la période cible. Chaque snapshot donne la même table
+# que table_modele à cette date (montants cumulés en entiers : sommes exactes au 1/10 000).
+
+
+def snapshots_mensuels(df_trans, n=12, mois=MOIS_CIBLE):
+    """Les ``n`` derniers snapshots mensuels dont la période cible (``mois`` mois) est complète,
+    du plus ancien au plus récent (le plus récent est celui de decouper_temporel)."""
+    dernier = df_trans['invoice_date'].max() - pd.DateOffset(months=mois)
+    return [dernier - pd.DateOffset(months=k) for k in range(n - 1, -1, -1)]
+
+
+def _cumul(valeurs):
+    # Sommes cumulées précédées d'un 0 : somme des lignes [a, b) = cumul[b] - cumul[a]
+    return np.concatenate([[0], np.cumsum(valeurs)])
+
+
+def _cumul_montants(montants):
+    # (cumul, échelle) : montant des lignes [a, b) = (cumul[b] - cumul[a]) / échelle. Les montants
+    # (prix à DECIMALES_PRIX décimales x quantités entières) sont cumulés en entiers de
+    # 10^-DECIMALES_PRIX : la différence de deux cumuls est exacte ; sinon, cumul en float64.
+    echelle = 10 ** DECIMALES_PRIX
+    unites = montants * echelle
+    entiers = np.round(unites)
+    if np.allclose(unites, entiers, rtol=0, atol=1e-6) and np.abs(entiers).sum() < 2 ** 62:
+        return _cumul(entiers.astype(np.int64)), echelle
+    return _cumul(montants), 1
+
+
+def _tri_client_date(codes, dates, n_clients):
+    # Tri (client, date) sur une seule clé entière : client x rang de la date parmi les dates
+    # distinctes. L'ordre des ex aequo (même client, même date) est sans importance : ces
+    # lignes sont toujours du même côté d'un point de coupe.
+    # Renvoie (ordre, dates triées, début de chaque client, coupes) ; coupes(date) donne, pour
+    # chaque client, la position de fin de ses lignes datées au plus tard de ``date``.
+    jours, rangs = np.unique(dates, return_inverse=True)
+    cles = codes.astype(np.int64) * (len(jours) + 1) + rangs.ravel()
+    ordre = np.argsort(cles)
+    cles = cles[ordre]
+    effectifs = np.bincount(codes, minlength=n_clients)
+    bases = np.arange(n_clients, dtype=np.int64) * (len(jours) + 1)
+
+    def coupes(date):
+        return np.searchsorted(cles, bases + np.searchsorted(jours, np.datetime64(date), side='right'))
+
+    return ordre, jours[rangs.ravel()[ordre]], np.cumsum(effectifs) - effectifs, coupes
+
+
+def table_modele_snapshots(df_trans, snapshots, mois=MOIS_CIBLE, factures=None):
+    """Features + ``target_12m_value`` pour chaque date de ``snapshots``, en un passage.
+
+    Table longue, une ligne par (customer_id, snapshot_date), triée par snapshot puis client :
+    pour un snapshot s, les clients ayant acheté au plus tard à s, leurs features calculées sur
+    les transactions <= s et leur CA sur ]s, s + ``mois`` mois].
+    ``factures`` : table des factures de ``df_trans`` (voir table_modele), construite si absente.
+    """
+    if factures is None:
+        factures = construire_factures(df_trans)
+    codes_clients, clients = _codes_clients(df_trans['customer_id'].to_numpy())
+    n_clients, n = len(clients), len(df_trans)
+
+    # Factures : dates, compteurs et montants, cumulés dans l'ordre (client, date)
+    codes_factures = np.searchsorted(clients, factures['customer_id'].to_numpy())
+    ordre, dates, debuts, coupes = _tri_client_date(codes_factures, factures['invoice_date'].to_numpy(), n_clients)
+    codes_factures = codes_factures[ordre]
+    mois_factures = _mois(dates)
+    n_factures = len(factures)
+    cumuls = {
+        'frequency': _cumul(np.ones(n_factures, dtype=np.int64)),
+        'total_items': _cumul(factures['n_items'].fillna(0).to_numpy(np.int64)[ordre]),
+        'peak_season_purchases': _cumul(factures['n_lines'].to_numpy(np.int64)[ordre]
+                                        * np.isin(mois_factures % 12 + 1, MOIS_HAUTE_SAISON)),
+        # Les mois ne décroissent pas dans un client : première apparition = changement de mois
+        'active_months': _cumul(np.r_[n_factures > 0, (codes_factures[1:] != codes_factures[:-1])
+                                      | (mois_factures[1:] != mois_factures[:-1])].astype(np.int64)[:n_factures]),
+    }
+    montants, echelle = _cumul_montants(factures['invoice_total'].to_numpy(np.float64)[ordre])
+
+    # Lignes : produits distincts et pays, qui ne sont pas des attributs de la facture
+    ordre_lignes, _, debuts_lignes, coupes_lignes = _tri_client_date(
+        codes_clients, df_trans['invoice_date'].to_numpy(), n_clients)
+    codes_clients = codes_clients[ordre_lignes]
+
+    # 1 à la première ligne (dans l'ordre des dates) de chaque couple (client, produit)
+    produits = _codes(df_trans['product_code'])[ordre_lignes]
+    valides = np.flatnonzero(produits >= 0)
+    couples = codes_clients[valides].astype(np.int64) * (int(produits.max(initial=-1)) + 1) + produits[valides]
+    nouveaux = np.zeros(n, dtype=np.int64)
+    nouveaux[valides[np.unique(couples, return_index=True)[1]]] = 1
+    produits_distincts = _cumul(nouveaux)
+
+    # Premier pays renseigné dans l'ordre du fichier parmi les lignes déjà vues : minimum cumulé
+    # de la position, par client (les clients suivants partent d'un niveau plus bas)
+    pays = df_trans['country']
+    positions = np.where(pays.notna().to_numpy()[ordre_lignes], ordre_lignes, n)
+    niveaux = (n_clients - 1 - codes_clients).astype(np.int64) * (n + 1) + positions
+    premier_pays = np.minimum.accumulate(niveaux) % (n + 1) if n else positions
+
+    # Points de coupe de chaque snapshot, puis une seule table longue
+    snapshots = [pd.Timestamp(snapshot) for snapshot in snapshots]
+    morceaux = []
+    for k, snapshot in enumerate(snapshots):
+        fins = coupes(snapshot)
+        connus = np.flatnonzero(fins > debuts)
+        fins_cible = coupes(snapshot + pd.DateOffset(months=mois))[connus]
+        morceaux.append((np.full(len(connus), k), connus, fins[connus], fins_cible,
+                         coupes_lignes(snapshot)[connus]))
+    numeros, connus, b, fins_cible, b_lignes = (np.concatenate(parts) for parts in zip(*morceaux)) if morceaux \
+        else (np.zeros(0, dtype=np.int64),) * 5
+    a, a_lignes = debuts[connus], debuts_lignes[connus]
+
+    base = pd.DataFrame({'customer_id': clients[connus],
+                         'last_purchase': dates[b - 1], 'first_purchase': dates[a]})
+    for nom, cumul in cumuls.items():
+        base[nom] = cumul[b] - cumul[a]
+    base.insert(4, 'monetary', (montants[b] - montants[a]) / echelle)
+    base.insert(5, 'unique_products', produits_distincts[b_lignes] - produits_distincts[a_lignes])
+    base['total_items'] = pd.array(base['total_items'].to_numpy(), dtype=df_trans['quantity'].dtype)
+    lignes_pays = premier_pays[b_lignes - 1]
+    base['country'] = pays.iloc[np.minimum(lignes_pays, max(n - 1, 0))].reset_index(drop=True).where(lignes_pays < n)
+
+    dates_snapshot = pd.Series(np.array(snapshots, dtype=dates.dtype)[numeros], name='snapshot_date')
+    df_final = _deriver_features(base, dates_snapshot)
+    df_final.insert(1, 'snapshot_date', dates_snapshot)
+    df_final['target_12m_value'] = (montants[fins_cible] - montants[b]) / echelle
+
+    # Infinis (division par zéro) -> vide, puis tous les vides à 0 (comme table_modele)
+    return df_final.replace([np.inf, -np.inf], np.nan).fillna(0)
+
+
+def entrainer_modeles(df_final, test_size=0.2):
+    """Entraîne la régression linéaire, la Random Forest et XGBoost sur un split temporel.
+
+    Renvoie ``(models, results, predictions, X_test, y_test)`` ; ``results`` contient
+    RMSE, MAE et R² de chaque modèle sur le jeu de test.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+    from xgboost import XGBRegressor
+
+    X = df_final.drop(columns=['customer_id', 'target_12m_value'])
+    y = df_final['target_12m_value']
+
+    # Split temporel (shuffle=False)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, shuffle=False)
+
+    models = {
+        "1. Régression Linéaire": LinearRegression(),
+        "2. Random Forest": RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
+        "3. XGBoost": XGBRegressor(n_estimators=100, learning_rate=0.1, random_state=42)
+    }
+
+    results = {}
+    predictions = {}
+    for name, model in models.items():
+        model.fit(X_train, y_train)
+        y_pred = np.maximum(0, model.predict(X_test))  # La CLV ne peut pas être négative
+        predictions[name] = y_pred
+
+        results[name] = {
+            'RMSE': np.sqrt(mean_squared_error(y_test, y_pred)),
+            'MAE': mean_absolute_error(y_test, y_pred),
+            'R²': r2_score(y_test, y_pred),
+        }
+    return models, results, predictions, X_test, y_test
@@ -0,0 +1,171 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# --- SUPPRESSION DES DOUBLONS HORS MÉMOIRE ---
+# Chaque ligne est résumée par une empreinte 64 bits (hash de toutes ses colonnes).
+# Passe 1 : on lit le fichier par blocs et on collecte (empreinte, numéro de ligne).
+#           Tant que le budget mémoire n'est pas dépassé, tout reste en RAM ; au-delà,
+#           les couples sont déversés sur disque dans des partitions (bits de poids fort).
+# Passe 2 : chaque partition est triée seule ; pour chaque empreinte, seule la première
+#           ligne est gardée (keep='first', comme drop_duplicates()).
+# Passe 3 : on relit le fichier et on ne produit que les lignes gardées, dans l'ordre.
+#
+# Colonnes numériques (``numeriques``) : comparées par valeur, comme après la lecture typée
+# de pd.read_csv (5, 5.0 et 5e0 sont la même valeur) ; un texte non numérique reste comparé
+# tel quel. Les autres colonnes sont comparées sur leur texte brut.
+#
+# Le résultat est identique à pd.read_csv(chemin).drop_duplicates() (colonnes numériques
+# dans ``numeriques``), à une collision d'empreintes près (probabilité ~ n² / 2^65, soit
+# ~3e-4 pour 100 millions de lignes).
+
+TAILLE_BLOC = 100_000
+BUDGET_MEMOIRE = 256 * 1024 ** 2  # octets réservés aux empreintes (16 octets par ligne)
+N_PARTITIONS = 64                 # puissance de 2
+
+
+def empreintes_lignes(bloc, numeriques=()):
+    """Empreinte 64 bits de chaque ligne d'un bloc (toutes colonnes, index ignoré).
+
+    Les colonnes ``numeriques`` sont comparées par valeur : chacune est remplacée par sa
+    valeur float64 et par le texte des valeurs qui ne sont pas des nombres.
+    """
+    numeriques = [col for col in numeriques if col in bloc.columns]
+    if numeriques:
+        colonnes = {}
+        for col in bloc.columns:
+            if col in numeriques:
+                valeurs = pd.to_numeric(bloc[col], errors='coerce').astype(np.float64)
+                colonnes[col] = valeurs
+                colonnes[col + ' (texte)'] = bloc[col].where(valeurs.isna())
+            else:
+                colonnes[col] = bloc[col]
+        bloc = pd.DataFrame(colonnes, index=bloc.index)
+    return pd.util.hash_pandas_object(bloc, index=False).to_numpy(dtype=np.uint64)
+
+
+def _premieres_occurrences(empreintes, positions):
+    """Positions des lignes qui répètent une empreinte déjà vue plus tôt."""
+    ordre = np.lexsort((positions, empreintes))
+    empreintes, positions = empreintes[ordre], positions[ordre]
+    repetition = np.empty(len(empreintes), dtype=bool)
+    repetition[:1] = False
+    repetition[1:] = empreintes[1:] == empreintes[:-1]
+    return positions[repetition]
+
+
+def marquer_doublons(chemin, taille_bloc=TAILLE_BLOC, budget_memoire=BUDGET_MEMOIRE,
+                     n_partitions=N_PARTITIONS, dossier_travail=None, numeriques=(), **options_csv):
+    """Passes 1 et 2 : renvoie ``(garder, dossier)``.
+
+    ``garder`` contient un octet par ligne du fichier (1 = première occurrence).
+    Si les empreintes ont été déversées sur disque, ``garder`` est lui aussi un
+    tableau projeté en mémoire (np.memmap) dans ``dossier``, à supprimer par l'appelant.
+    """
+    bits = int(np.log2(n_partitions))
+    decalage = np.uint64(64 - bits)
+
+    en_memoire_emp, en_memoire_pos = [], []
+    octets_en_memoire = 0
+    dossier = None
+    fichiers = None
+    n_lignes = 0
+
+    for bloc in pd.read_csv(chemin, chunksize=taille_bloc, **options_csv):
+        empreintes = empreintes_lignes(bloc, numeriques)
+        positions = np.arange(n_lignes, n_lignes + len(bloc), dtype=np.int64)
+        n_lignes += len(bloc)
+
+        if fichiers is None:
+            en_memoire_emp.append(empreintes)
+            en_memoire_pos.append(positions)
+            octets_en_memoire += empreintes.nbytes + positions.nbytes
+            if octets_en_memoire <= budget_memoire:
+                continue
+
+            # Budget dépassé : on bascule en partitions sur disque
+            dossier = tempfile.mkdtemp(prefix='doublons_', dir=dossier_travail)
+            fichiers = [(open(os.path.join(dossier, f'emp_{p}.bin'), 'wb'),
+                         open(os.path.join(dossier, f'pos_{p}.bin'), 'wb')) for p in range(n_partitions)]
+            empreintes = np.concatenate(en_memoire_emp)
+            positions = np.concatenate(en_memoire_pos)
+            en_memoire_emp, en_memoire_pos = [], []
+
+        partition = (empreintes >> decalage).astype(np.int64)
+        ordre = np.argsort(partition, kind='stable')
+        bornes = np.searchsorted(partition[ordre], np.arange(n_partitions + 1))
+        for p in range(n_partitions):
+            sel = ordre[bornes[p]:bornes[p + 1]]
+            if len(sel):
+                empreintes[sel].tofile(fichiers[p][0])
+                positions[sel].tofile(fichiers[p][1])
+
+    # --- Passe 2 : une partition à la fois ---
+    if fichiers is None:
+        garder = np.ones(n_lignes, dtype=np.uint8)
+        if en_memoire_emp:
+            garder[_premieres_occurrences(np.concatenate(en_memoire_emp), np.concatenate(en_memoire_pos))] = 0
+        return garder, None
+
+    for f_emp, f_pos in fichiers:
+        f_emp.close()
+        f_pos.close()
+
+    garder = np.lib.format.open_memmap(os.path.join(dossier, 'garder.npy'), mode='w+',
+                                       dtype=np.uint8, shape=(n_lignes,))
+    garder[:] = 1
+    for p in range(n_partitions):
+        empreintes = np.fromfile(os.path.join(dossier, f'emp_{p}.bin'), dtype=np.uint64)
+        positions = np.fromfile(os.path.join(dossier, f'pos_{p}.bin'), dtype=np.int64)
+        garder[_premieres_occurrences(empreintes, positions)] = 0
+        os.remove(os.path.join(dossier, f'emp_{p}.bin'))
+        os.remove(os.path.join(dossier, f'pos_{p}.bin'))
+    garder.flush()
+    return garder, dossier
+
+
+def iterer_sans_doublons(chemin, taille_bloc=TAILLE_BLOC, budget_memoire=BUDGET_MEMOIRE,
+                         n_partitions=N_PARTITIONS, dossier_travail=None, bilan=None, numeriques=(),
+                         **options_csv):
+    """Produit les blocs de ``chemin`` privés de leurs doublons (première occurrence gardée).
+
+    Fonctionne sur n'importe quel CSV (customers.csv, transactions.csv, ...) ;
+    ``numeriques`` : colonnes comparées par valeur ; ``options_csv`` est transmis à
+    pd.read_csv (dtype, usecols, ...).
+    """
+    if bilan is None:
+        bilan = {}
+    garder, dossier = marquer_doublons(chemin, taille_bloc, budget_memoire, n_partitions,
+                                       dossier_travail, numeriques, **options_csv)
+    bilan['lignes_initiales'] = len(garder)
+    bilan['doublons'] = int(len(garder) - np.count_nonzero(garder))
+    bilan['deverse_sur_disque'] = dossier is not None
+
+    try:
+        debut = 0
+        for bloc in pd.read_csv(chemin, chunksize=taille_bloc, **options_csv):
+            masque = np.asarray(garder[debut:debut + len(bloc)], dtype=bool)
+            debut += len(bloc)
+            yield bloc[masque]
+    finally:
+        del garder
+        if dossier is not None:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+
+def dedoublonner_csv(chemin, chemin_sortie, taille_bloc=TAILLE_BLOC, budget_memoire=BUDGET_MEMOIRE,
+                     n_partitions=N_PARTITIONS, dossier_travail=None, numeriques=()):
+    """Écrit ``chemin_sortie`` = ``chemin`` sans doublons, en mémoire bornée. Renvoie le bilan.
+
+    ``numeriques`` : colonnes comparées par valeur (par exemple ``colonnes_numeriques(schema_clients)``).
+    """
+    bilan = {}
+    premier = True
+    for bloc in iterer_sans_doublons(chemin, taille_bloc, budget_memoire, n_partitions, dossier_travail,
+                                     bilan=bilan, numeriques=numeriques, dtype=str):
+        bloc.to_csv(chemin_sortie, mode='w' if premier else 'a', header=premier, index=False)
+        premier = False
+    return bilan
@@ -0,0 +1,588 @@
+import matplotlib
+matplotlib.use('Agg')  # rendu sans affichage : les graphiques sont uniquement sauvegardés
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap
+
+from commun.quantiles import ResumeQuantiles, distribution_tronquee
+from commun.rfm import clients_a_risque, clients_perdus, part_segment
+from commun.segmentation import noms_clusters
+
+# --- DESCRIPTION DE CHAQUE GRAPHIQUE DU DOSSIER GRAPHIQUE ---
+# Une fonction par image : elle reçoit les données préparées une seule fois
+# (voir commun.rendu.Donnees) et le chemin du PNG à écrire.
+
+palette_clusters = ['skyblue', 'hotpink', 'purple', '#FFD700']
+
+
+def habiller_axes(ax, grille=True):
+    # Textes, axes et grille en VIOLET
+    ax.tick_params(colors='purple')
+    for spine in ax.spines.values():
+        spine.set_color('purple')
+    if grille:
+        ax.grid(True, linestyle='--', alpha=0.3, color='purple')
+
+
+# --- NUAGES DE POINTS : MODE DENSITÉ ---
+# Au-delà de SEUIL_DENSITE points, dessiner un marqueur par client devient lent et illisible.
+# Les points sont alors comptés dans une grille fixe (RESOLUTION_DENSITE x RESOLUTION_DENSITE)
+# et c'est la grille qui est dessinée : le temps de rendu ne dépend plus du nombre de lignes.
+# Le mode se choisit avec Donnees(mode_nuage='auto' | 'points' | 'densite').
+
+SEUIL_DENSITE = 100_000
+RESOLUTION_DENSITE = 300
+cmap_densite = LinearSegmentedColormap.from_list("densite", ["skyblue", "hotpink", "purple"])
+
+
+def mode_densite(d, n_points):
+    mode = getattr(d, 'mode_nuage', 'auto')
+    return mode == 'densite' or (mode == 'auto' and n_points > SEUIL_DENSITE)
+
+
+def grille_densite(x, y, groupes=None, n_groupes=1, resolution=RESOLUTION_DENSITE, etendue=None):
+    """Nombre de points par case de la grille, un plan par groupe : tableau (n_groupes, resolution, resolution).
+
+    ``etendue`` = (xmin, xmax, ymin, ymax) ; par défaut, celle des données.
+    ``groupes`` contient le numéro de groupe (0 .. n_groupes-1) de chaque point.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if etendue is None:
+        etendue = (x.min(), x.max(), y.min(), y.max())
+    x0, x1, y0, y1 = etendue
+
+    dedans = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    ix = np.minimum(((x[dedans] - x0) / ((x1 - x0) or 1) * resolution).astype(np.int64), resolution - 1)
+    iy = np.minimum(((y[dedans] - y0) / ((y1 - y0) or 1) * resolution).astype(np.int64), resolution - 1)
+    case = iy * resolution + ix
+    if groupes is not None:
+        case += np.asarray(groupes, dtype=np.int64)[dedans] * resolution * resolution
+
+    comptes = np.bincount(case, minlength=n_groupes * resolution * resolution)
+    return comptes.reshape(n_groupes, resolution, resolution), etendue
+
+
+def dessiner_densite(ax, x, y, groupes=None, couleurs=None, resolution=RESOLUTION_DENSITE):
+    """Dessine la grille de densité sur ``ax``.
+
+    Sans groupes : intensité = nombre de points (échelle log). Avec groupes : chaque case
+    prend la couleur du groupe majoritaire et son opacité suit le nombre de points.
+    """
+    from matplotlib.colors import LogNorm, to_rgba
+
+    n_groupes = 1 if groupes is None else len(couleurs)
+    comptes, etendue = grille_densite(x, y, groupes, n_groupes, resolution)
+    options = dict(origin='lower', extent=etendue, aspect='auto', interpolation='nearest')
+
+    if groupes is None:
+        plan = np.ma.masked_equal(comptes[0], 0)
+        return ax.imshow(plan, cmap=cmap_densite, norm=LogNorm(vmin=1, vmax=max(plan.max(), 1)), **options)
+
+    total = comptes.sum(axis=0)
+    image = np.array([to_rgba(c) for c in couleurs])[comptes.argmax(axis=0)]
+    image[..., 3] = np.log1p(total) / np.log1p(max(total.max(), 1))
+    return ax.imshow(image, **options)
+
+
+def legende_groupes(ax, labels, couleurs, **options):
+    """Légende des groupes d'une grille de densité (une pastille par groupe)."""
+    from matplotlib.patches import Patch
+    return ax.legend(handles=[Patch(color=c, label=l) for l, c in zip(labels, couleurs)], **options)
+
+
+def _histogramme(resume, chemin, bins, titre, xlabel, format_legende, q=0.95):
+    """Histogramme bleu ciel + moyenne et médiane en rose (gabarit commun des distributions).
+
+    ``resume`` (ResumeQuantiles) fournit le seuil du quantile ``q``, les effectifs par
+    intervalle, la moyenne et la médiane des valeurs sous ce seuil.
+    """
+    comptes, bords, moyenne, mediane = distribution_tronquee(resume, bins, q)
+    plt.figure(figsize=(10, 6))
+
+    # Histogramme (barres) en BLEU CIEL avec des contours en VIOLET
+    plt.hist(bords[:-1], bins=bords, weights=comptes, color='skyblue', edgecolor='purple', alpha=0.8)
+
+    # Ajout des lignes pour la moyenne et la médiane en ROSE
+    plt.axvline(moyenne, color='hotpink', linestyle='dashed', linewidth=2.5,
+                label=f'Moyenne ({format_legende(moyenne)})')
+    plt.axvline(mediane, color='hotpink', linestyle='dotted', linewidth=2.5,
+                label=f'Médiane ({format_legende(mediane)})')
+
+    # Titres et labels en VIOLET
+    plt.title(titre, fontsize=15, pad=15, color='purple', fontweight='bold')
+    plt.xlabel(xlabel, fontsize=12, color='purple')
+    plt.ylabel("Nombre de Clients", fontsize=12, color='purple')
+
+    habiller_axes(plt.gca())
+    plt.legend(loc='upper right', frameon=True, labelcolor='purple')
+
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def _nuage_tendance(x, y, chemin, titre, xlabel, ylabel, densite=False):
+    """Nuage de points bleu ciel + droite de tendance rose (gabarit des corrélations TP1)."""
+    plt.figure(figsize=(10, 6))
+
+    # Nuage de points en BLEU CIEL (ou grille de densité pour les grandes bases)
+    if densite:
+        dessiner_densite(plt.gca(), x, y)
+    else:
+        plt.scatter(x, y, alpha=0.4, color='skyblue', edgecolors='none', s=20)
+
+    # Ligne de tendance en ROSE (une droite : ses deux extrémités suffisent)
+    z = np.polyfit(x, y, 1)
+    p = np.poly1d(z)
+    bornes = np.array([x.min(), x.max()])
+    plt.plot(bornes, p(bornes), color='hotpink', linestyle='--', linewidth=2.5, label="Tendance")
+
+    plt.title(titre, fontsize=14, pad=15, color='purple', fontweight='bold')
+    plt.xlabel(xlabel, fontsize=12, color='purple')
+    plt.ylabel(ylabel, fontsize=12, color='purple')
+
+    habiller_axes(plt.gca())
+    plt.legend(loc='upper right', frameon=True, labelcolor='purple')
+
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+# =========================================================
+# TP1 : EXPLORATION DE LA BASE NETTOYÉE
+# =========================================================
+
+def repartition_clients(d, chemin):
+    df_clean = d.clients
+    clients_uniques = int((df_clean['n_orders'] <= 1.0).sum())
+    clients_recurrents = int((df_clean['n_orders'] > 1.0).sum())
+
+    labels = ['Transaction Unique\n(≤ 1 commande)', 'Clients Récurrents\n(> 1 commande)']
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.pie(
+        [clients_uniques, clients_recurrents],
+        explode=(0.1, 0),             # Détache légèrement la part "Transaction unique"
+        labels=labels,
+        colors=['#ff9999', '#66b3ff'],
+        autopct='%1.1f%%',
+        shadow=True,
+        startangle=140,
+        textprops={'fontsize': 12}
+    )
+    ax.axis('equal')  # Camembert parfaitement circulaire
+    plt.title("Répartition des Clients : Transaction Unique vs Récurrents\n(Sur base nettoyée)", fontsize=14, pad=20)
+
+    plt.savefig(chemin, bbox_inches='tight')
+    plt.close(fig)
+
+
+def correlation_recence_montant(d, chemin):
+    df_clean = d.clients.dropna(subset=['recency_days', 'total_spent'])
+
+    # On ne garde que les 95% des valeurs normales pour la lisibilité
+    q_spent = d.resumes['total_spent'].quantile(0.95)
+    df_plot = df_clean[df_clean['total_spent'] <= q_spent]
+    correlation = df_clean['recency_days'].corr(df_clean['total_spent'])
+
+    _nuage_tendance(
+        df_plot['recency_days'], df_plot['total_spent'], chemin,
+        f"Corrélation entre la Récence et le Montant Dépensé\nCoefficient : {correlation:.2f}",
+        "Récence (Jours depuis le dernier achat)", "Montant Total Dépensé (€)",
+        densite=mode_densite(d, len(df_plot))
+    )
+
+
+def frequence_panier_moyen(d, chemin):
+    df_clean = d.clients.dropna(subset=['n_orders', 'avg_basket'])
+
+    # On filtre les valeurs extrêmes (au-delà du 95e percentile) pour un graphique lisible
+    q_orders = d.resumes['n_orders'].quantile(0.95)
+    q_basket = d.resumes['avg_basket'].quantile(0.95)
+    df_plot = df_clean[(df_clean['n_orders'] <= q_orders) & (df_clean['avg_basket'] <= q_basket)]
+    correlation = df_clean['n_orders'].corr(df_clean['avg_basket'])
+
+    _nuage_tendance(
+        df_plot['n_orders'], df_plot['avg_basket'], chemin,
+        f"Fréquence vs Panier Moyen\nCoefficient de corrélation : {correlation:.2f}",
+        "Fréquence (Nombre de commandes)", "Panier Moyen (€)",
+        densite=mode_densite(d, len(df_plot))
+    )
+
+
+def segments_naturels(d, chemin):
+    df_clean = d.clients.dropna(subset=['recency_days', 'n_orders', 'total_spent'])
+
+    # On ne garde que les 95% des valeurs normales pour éviter l'écrasement visuel
+    q = {col: d.resumes[col].quantile(0.95) for col in ['recency_days', 'n_orders', 'total_spent']}
+    df_plot = df_clean[
+        (df_clean['recency_days'] <= q['recency_days']) &
+        (df_clean['n_orders'] <= q['n_orders']) &
+        (df_clean['total_spent'] <= q['total_spent'])
+    ]
+
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    fig.suptitle("Recherche visuelle de segments naturels (Récence, Fréquence, Montant)",
+                 fontsize=16, color='purple', fontweight='bold', y=1.05)
+
+    paires = [
+        ('recency_days', 'n_orders', "Récence vs Fréquence", "Récence (Jours)", "Fréquence (Commandes)"),
+        ('recency_days', 'total_spent', "Récence vs Montant Total", "Récence (Jours)", "Montant Dépensé (€)"),
+        ('n_orders', 'total_spent', "Fréquence vs Montant Total", "Fréquence (Commandes)", "Montant Dépensé (€)"),
+    ]
+    densite = mode_densite(d, len(df_plot))
+    for ax, (x, y, titre, xlabel, ylabel) in zip(axes, paires):
+        if densite:
+            dessiner_densite(ax, df_plot[x], df_plot[y])
+        else:
+            ax.scatter(df_plot[x], df_plot[y], alpha=0.3, color='skyblue', s=10)
+        ax.set_title(titre, color='purple')
+        ax.set_xlabel(xlabel, color='purple')
+        ax.set_ylabel(ylabel, color='purple')
+        habiller_axes(ax)
+
+    plt.tight_layout()
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+# =========================================================
+# TP2 : DISTRIBUTIONS
+# =========================================================
+
+def distribution_montant(d, chemin):
+    _histogramme(d.resumes['total_spent'], chemin, 50,
+                 "Distribution du Montant Total Dépensé (Sous le 95e percentile)",
+                 "Montant Total Dépensé (€)", lambda v: f"{v:.0f} €")
+
+
+def distribution_panier_moyen(d, chemin):
+    _histogramme(d.resumes['avg_basket'], chemin, 50,
+                 "Distribution du Panier Moyen (Sous le 95e percentile)",
+                 "Panier Moyen (€)", lambda v: f"{v:.1f} €")
+
+
+def distribution_frequence(d, chemin):
+    _histogramme(d.resumes['n_orders'], chemin, 40,
+                 "Distribution de la Fréquence (Sous le 95e percentile)",
+                 "Fréquence (Nombre de commandes / n_orders)", lambda v: f"{v:.1f} cmds")
+
+
+def distribution_anciennete(d, chemin):
+    # Résumé sans les anciennetés négatives (erreurs de saisie CRM), filtré à 95% des données
+    _histogramme(d.resumes['tenure_days'], chemin, 40,
+                 "Distribution de l'Ancienneté des Clients (Tenure)\n(Sous le 95e percentile)",
+                 "Ancienneté (Nombre de jours depuis le premier achat)", lambda v: f"{v:.0f} jours")
+
+
+def distribution_promotions(d, chemin):
+    _histogramme(ResumeQuantiles().ajouter(d.promotions['promo_percentage']), chemin, 20,
+                 "Proportion des achats réalisés en période de promotion",
+                 "Part des achats en promotion (%)", lambda v: f"{v:.1f} %", q=1.0)
+
+
+def distribution_articles(d, chemin):
+    # Pour la lisibilité, on exclut le top 5% des clients (les gros acheteurs)
+    _histogramme(ResumeQuantiles().ajouter(d.articles['n_categories']), chemin, 15,
+                 "Distribution du Nombre d'Articles Distincts par Client\n(Sous le 95e percentile)",
+                 "Nombre de types d'articles achetés", lambda v: f"{v:.1f} articles distincts")
+
+
+# =========================================================
+# TP2 : CORRÉLATIONS ET RFM
+# =========================================================
+
+def heatmap_correlation(d, chemin):
+    import seaborn as sns
+
+    colonnes = {'recency_days': 'Récence', 'n_orders': 'Fréquence', 'total_spent': 'Montant Total',
+                'avg_basket': 'Panier Moyen', 'tenure_days': 'Ancienneté'}
+    corr = d.clients[list(colonnes)].dropna().rename(columns=colonnes).corr()
+
+    plt.figure(figsize=(10, 8))
+    cmap_perso = LinearSegmentedColormap.from_list("custom_cmap", ["skyblue", "white", "hotpink", "purple"])
+    ax = sns.heatmap(corr, annot=True, fmt=".2f", cmap=cmap_perso, vmin=-1, vmax=1,
+                     linewidths=1, linecolor='purple', cbar_kws={'label': 'Niveau de Corrélation'})
+
+    plt.title("Matrice de Corrélation des Comportements Clients",
+              fontsize=16, color='purple', fontweight='bold', pad=20)
+    plt.xticks(color='purple', rotation=45, ha='right', fontsize=11)
+    plt.yticks(color='purple', rotation=0, fontsize=11)
+
+    cbar = ax.collections[0].colorbar
+    cbar.ax.yaxis.set_tick_params(colors='purple')
+    cbar.set_label('Niveau de Corrélation', color='purple', size=12, labelpad=15)
+
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def rfm_heatmap_montant(d, chemin):
+    import seaborn as sns
+
+    # Montant moyen par croisement Récence x Fréquence (5 = meilleur score en haut)
+    heatmap_data = d.cube.tableau('R_Score', 'F_Score', 'moyenne').sort_index(ascending=False)
+
+    plt.figure(figsize=(10, 8))
+    custom_cmap = LinearSegmentedColormap.from_list("custom_cmap", ["skyblue", "hotpink", "purple"])
+    ax = sns.heatmap(heatmap_data, annot=True, fmt=".0f", cmap=custom_cmap, linewidths=.5,
+                     cbar_kws={'label': 'Montant Moyen (€)'})
+
+    plt.title("Matrice RFM : Montant Moyen par Récence et Fréquence",
+              fontsize=15, pad=15, color='purple', fontweight='bold')
+    plt.ylabel("Score Récence (5 = Très Récent)", fontsize=12, color='purple')
+    plt.xlabel("Score Fréquence (5 = Très Fidèle)", fontsize=12, color='purple')
+    habiller_axes(ax, grille=False)
+
+    cbar = ax.collections[0].colorbar
+    cbar.ax.yaxis.set_tick_params(colors='purple')
+    cbar.set_label('Montant Moyen (€)', color='purple', size=12, labelpad=15)
+
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def _camembert(tailles, labels, titre, chemin):
+    plt.figure(figsize=(8, 8))
+    plt.pie(
+        tailles,
+        labels=labels,
+        colors=['hotpink', 'skyblue'],
+        autopct='%1.1f%%',
+        startangle=140,
+        textprops={'fontsize': 12, 'color': 'purple', 'fontweight': 'bold'},
+        explode=(0.1, 0),  # Fait ressortir la première part
+        shadow=True
+    )
+    plt.title(titre, fontsize=14, color='purple', fontweight='bold', pad=20)
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def rfm_perdus(d, chemin):
+    # Dessin seul : les indicateurs sont affichés par TP2/script_perdus_transac.py
+    # (un graphique repris du cache n'est pas redessiné)
+    perdus = part_segment(d.cube, clients_perdus)
+    _camembert([perdus['effectif'], perdus['total_clients'] - perdus['effectif']],
+               ['Base Perdue\n(Score 111)', 'Reste de la base'],
+               "Proportion de la Base Clients 'Perdue' (Score RFM 111)", chemin)
+
+
+def rfm_a_risque(d, chemin):
+    # Dessin seul : les indicateurs sont affichés par TP2/script_risques_transac.py
+    a_risque = part_segment(d.cube, clients_a_risque)
+    _camembert([a_risque['montant'], a_risque['total_ca'] - a_risque['montant']],
+               ['Part du CA menacée\n(Clients "À risque")', 'CA sécurisé\n(Autres clients)'],
+               "Part du Chiffre d'Affaires menacée par l'attrition", chemin)
+
+
+# =========================================================
+# TP2 : SEGMENTS (CLUSTERS K-MEANS)
+# =========================================================
+
+def pca_umap_clusters(d, chemin):
+    import seaborn as sns
+    from sklearn.decomposition import PCA
+    from commun.projection import TAILLE_APPRENTISSAGE, projeter
+    try:
+        import umap.umap_ as umap
+        HAS_UMAP = True
+    except ImportError:
+        HAS_UMAP = False
+        from sklearn.manifold import TSNE
+
+    df_clean = d.segments.copy()
+    data_scaled = d.rfm_standardise
+
+    # PCA (structure globale)
+    pca_result = PCA(n_components=2).fit_transform(data_scaled)
+    df_clean['PCA1'] = pca_result[:, 0]
+    df_clean['PCA2'] = pca_result[:, 1]
+
+    # UMAP ou t-SNE (îlots locaux) : appris sur un échantillon par cluster, les autres
+    # clients sont placés par plus proches voisins (voir commun.projection)
+    if HAS_UMAP:
+        ajuster = umap.UMAP(n_neighbors=15, min_dist=0.1, random_state=42).fit_transform
+        dim1, dim2, title2 = 'UMAP1', 'UMAP2', "2. UMAP (Structure Locale)"
+    else:
+        ajuster = TSNE(n_components=2, random_state=42, perplexity=30).fit_transform
+        dim1, dim2, title2 = 'TSNE1', 'TSNE2', "2. t-SNE (Substitut à UMAP)"
+    resultat = projeter(data_scaled, df_clean['Cluster'].to_numpy(), ajuster)
+    if len(df_clean) > TAILLE_APPRENTISSAGE:
+        title2 += f"\n(appris sur {TAILLE_APPRENTISSAGE:,} clients, autres placés par voisinage)".replace(',', ' ')
+    df_clean[dim1] = resultat[:, 0]
+    df_clean[dim2] = resultat[:, 1]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+    densite = mode_densite(d, len(df_clean))
+    for ax, (x, y) in [(ax1, ('PCA1', 'PCA2')), (ax2, (dim1, dim2))]:
+        if densite:
+            dessiner_densite(ax, df_clean[x], df_clean[y], groupes=df_clean['Cluster'], couleurs=palette_clusters)
+            legende_groupes(ax, range(4), palette_clusters, title='Cluster', title_fontsize='11')
+        else:
+            sns.scatterplot(x=x, y=y, hue='Cluster', palette=palette_clusters,
+                            data=df_clean, alpha=0.7, edgecolor='w', s=50, ax=ax)
+            ax.legend(title='Cluster', title_fontsize='11')
+
+    ax1.set_title("1. PCA (Aperçu Rapide - Structure Globale)", color='purple', fontsize=14, fontweight='bold')
+    ax1.set_xlabel("Composante Principale 1", color='purple')
+    ax1.set_ylabel("Composante Principale 2", color='purple')
+    ax2.set_title(title2, color='purple', fontsize=14, fontweight='bold')
+    ax2.set_xlabel(f"Dimension {dim1}", color='purple')
+    ax2.set_ylabel(f"Dimension {dim2}", color='purple')
+
+    for ax in [ax1, ax2]:
+        habiller_axes(ax, grille=False)
+
+    plt.suptitle("Projection 2D des Clusters RFM (K-Means)", color='purple', fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def heatmap_features_clusters(d, chemin):
+    import seaborn as sns
+
+    # A. Vrai chiffre moyen pour les textes ; B. mise à l'échelle 0-1 par colonne pour les couleurs
+    resume = d.resume_clusters
+    df_moyennes = resume.loc[resume['Effectif'] > 0, ['Récence', 'Fréquence', 'Montant Total']]
+    etendue = (df_moyennes.max() - df_moyennes.min()).replace(0, 1)
+    df_couleurs = (df_moyennes - df_moyennes.min()) / etendue
+
+    plt.figure(figsize=(10, 6))
+    custom_cmap = LinearSegmentedColormap.from_list("custom_cmap", ["skyblue", "white", "hotpink", "purple"])
+    ax = sns.heatmap(df_couleurs, annot=df_moyennes, fmt=".1f", cmap=custom_cmap,
+                     linewidths=1, linecolor='purple', cbar=False)
+
+    plt.title("Moyenne des Features RFM par Segment (Cluster)",
+              color='purple', fontsize=16, fontweight='bold', pad=20)
+    plt.ylabel("Segments (Clusters)", color='purple', fontsize=13)
+    plt.xticks(rotation=0, color='purple', fontsize=11)
+    plt.yticks(color='purple', fontsize=11)
+    for spine in ax.spines.values():
+        spine.set_color('purple')
+
+    plt.tight_layout()
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def profil_demographique(d, chemin):
+    import seaborn as sns
+
+    # Tout vient de la table des segments (quartiles d'ancienneté, parts des pays)
+    resume = d.resume_clusters
+    resume = resume[resume['Effectif_Profil'] > 0]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    # -- Graphique 1 : Ancienneté par Cluster (Boxplot à partir des quartiles) --
+    boites = [{'label': nom, 'q1': ligne['Anc_q1'], 'med': ligne['Anc_mediane'], 'q3': ligne['Anc_q3'],
+               'whislo': ligne['Anc_moustache_basse'], 'whishi': ligne['Anc_moustache_haute'],
+               'fliers': np.asarray(ligne['Anc_atypiques'])}
+              for nom, ligne in resume.iterrows()]
+    dessin = ax1.bxp(
+        boites, widths=0.6, patch_artist=True,
+        boxprops=dict(alpha=0.8, edgecolor='purple'),
+        medianprops=dict(color='white', linewidth=2),
+        whiskerprops=dict(color='0.15'), capprops=dict(color='0.15'),
+        flierprops=dict(marker='o', markeredgecolor='0.15', markersize=3, alpha=0.3)
+    )
+    for boite, cluster in zip(dessin['boxes'], resume['Cluster']):
+        # Même rendu que seaborn (couleurs désaturées à 75 %)
+        boite.set_facecolor(sns.desaturate(palette_clusters[cluster], 0.75))
+    ax1.set_title("1. Ancienneté (Tenure) selon les Clusters", color='purple', fontsize=14, fontweight='bold')
+    ax1.set_xlabel("Segments (Clusters)", color='purple')
+    ax1.set_ylabel("Ancienneté (Jours depuis le 1er achat)", color='purple')
+
+    # -- Graphique 2 : Répartition Géographique (4 pays principaux + "Autres") --
+    cross_tab = resume.filter(like='Pays_').rename(columns=lambda col: col[len('Pays_'):])
+    cross_tab.columns.name = 'Pays_Abrege'
+
+    colors_pays = ['skyblue', 'hotpink', '#FFD700', 'purple', 'lightgreen']
+    cross_tab.plot(kind='bar', stacked=True, ax=ax2, color=colors_pays[:len(cross_tab.columns)],
+                   edgecolor='white', alpha=0.9)
+    ax2.set_title("2. Répartition Géographique (Pays) par Cluster", color='purple', fontsize=14, fontweight='bold')
+    ax2.set_xlabel("Segments (Clusters)", color='purple')
+    ax2.set_ylabel("Pourcentage de clients (%)", color='purple')
+    ax2.legend(title='Pays', bbox_to_anchor=(1.05, 1), loc='upper left', labelcolor='purple')
+    ax2.set_xticklabels(ax2.get_xticklabels(), rotation=0)
+
+    for ax in [ax1, ax2]:
+        ax.grid(True, linestyle='--', alpha=0.3, color='purple', axis='y')
+        habiller_axes(ax, grille=False)
+
+    plt.suptitle("Profil Démographique des Segments (Ancienneté & Pays)", color='purple', fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+def scatter_recence_montant(d, chemin):
+    import seaborn as sns
+
+    df_clean = d.segments
+    order_clusters = [noms_clusters[i] for i in range(4)]
+    legende = dict(title='Segments (Clusters)', bbox_to_anchor=(1.02, 1), loc='upper left',
+                   labelcolor='purple', title_fontsize='11')
+    plt.figure(figsize=(12, 8))
+    if mode_densite(d, len(df_clean)):
+        dessiner_densite(plt.gca(), df_clean['Récence'], df_clean['Montant Total'],
+                         groupes=df_clean['Cluster'], couleurs=palette_clusters)
+        legende_groupes(plt.gca(), order_clusters, palette_clusters, **legende)
+    else:
+        sns.scatterplot(x='Récence', y='Montant Total', hue='Nom_Cluster', hue_order=order_clusters,
+                        palette=palette_clusters, data=df_clean, alpha=0.6, edgecolor='w', s=40)
+        plt.legend(**legende)
+
+    plt.title("Relation entre la Récence et le Montant Dépensé (par Segment)",
+              color='purple', fontsize=16, fontweight='bold', pad=20)
+    plt.ylabel("Montant Total Dépensé (€)", color='purple', fontsize=13)
+
+    # Inversion de l'axe X (meilleure pratique marketing RFM)
+    plt.gca().invert_xaxis()
+    plt.xlabel("Récence (Jours depuis le dernier achat) ➔ Plus récent", color='purple', fontsize=13)
+    habiller_axes(plt.gca())
+
+    plt.tight_layout()
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
+
+
+# --- REGISTRE : nom du fichier -> (fonction, données préparées nécessaires, entrées) ---
+# Les entrées déclarent les colonnes sources (table clients nettoyée, transactions) et
+# les paramètres de Donnees dont dépend l'image : le rendu n'est refait que si leur
+# contenu change (voir commun.rendu.empreinte_graphique).
+RFM = ['recency_days', 'n_orders', 'total_spent']
+NUAGE = ['mode_nuage']
+SEGMENTATION = ['segmentation']
+
+GRAPHIQUES = {
+    'repartition_clients.png': (repartition_clients, ['clients'], {'clients': ['n_orders']}),
+    'correlation_recency_spent_colors.png': (correlation_recence_montant, ['clients', 'resumes'],
+                                             {'clients': ['recency_days', 'total_spent'], 'parametres': NUAGE}),
+    'frequency_vs_basket_colors.png': (frequence_panier_moyen, ['clients', 'resumes'],
+                                       {'clients': ['n_orders', 'avg_basket'], 'parametres': NUAGE}),
+    'segments_naturels.png': (segments_naturels, ['clients', 'resumes'], {'clients': RFM, 'parametres': NUAGE}),
+    'distribution_montant_colors.png': (distribution_montant, ['resumes'], {'clients': ['total_spent']}),
+    'distribution_panier_moyen_colors.png': (distribution_panier_moyen, ['resumes'], {'clients': ['avg_basket']}),
+    'distribution_frequence_colors.png': (distribution_frequence, ['resumes'], {'clients': ['n_orders']}),
+    'distribution_anciennete_colors.png': (distribution_anciennete, ['resumes'], {'clients': ['tenure_days']}),
+    'distribution_promotions_colors.png': (distribution_promotions, ['promotions'],
+                                           {'transactions': ['invoice_id', 'customer_id', 'invoice_date']}),
+    'distribution_articles_colors.png': (distribution_articles, ['articles'],
+                                         {'transactions': ['customer_id', 'product_code']}),
+    'heatmap_correlation_colors.png': (heatmap_correlation, ['clients'],
+                                       {'clients': RFM + ['avg_basket', 'tenure_days']}),
+    'rfm_heatmap_montant_colors.png': (rfm_heatmap_montant, ['cube'], {'clients': RFM}),
+    'rfm_perdus_colors.png': (rfm_perdus, ['cube'], {'clients': RFM}),
+    'rfm_a_risque_ca_colors.png': (rfm_a_risque, ['cube'], {'clients': RFM}),
+    'pca_umap_clusters_colors.png': (pca_umap_clusters, ['segments', 'rfm_standardise'],
+                                     {'clients': RFM, 'parametres': NUAGE + SEGMENTATION}),
+    'heatmap_features_clusters_colors.png': (heatmap_features_clusters, ['resume_clusters'],
+                                             {'clients': RFM, 'parametres': SEGMENTATION}),
+    'profil_demographique_colors.png': (profil_demographique, ['resume_clusters'],
+                                        {'clients': RFM + ['tenure_days', 'country'], 'parametres': SEGMENTATION}),
+    'scatter_recence_montant_colors.png': (scatter_recence_montant, ['segments'],
+                                           {'clients': RFM, 'parametres': NUAGE + SEGMENTATION}),
+}
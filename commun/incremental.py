@@ -0,0 +1,264 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from commun.doublons import empreintes_lignes
+from commun.nettoyage import separer_clients, TAILLE_BLOC
+from commun.regles import regles_clients
+from commun.schema import colonnes_numeriques, schema_clients
+
+# --- NETTOYAGE INCRÉMENTAL (customers.csv ne grandit que par ajouts) ---
+# L'état mémorise :
+#   - le filigrane : nombre d'octets et de lignes déjà traités, plus l'empreinte des
+#     derniers octets avant le filigrane (pour détecter une réécriture du fichier) ;
+#   - l'index des empreintes 64 bits des lignes déjà vues, stocké en "runs" triés
+#     (.npy, lus en mmap) : une nouvelle ligne est un doublon si elle y figure. Les
+#     empreintes de chaque bloc y sont ajoutées aussitôt (un run par bloc) et deux runs
+#     de tailles voisines sont fusionnés : ~log2(n) runs, mémoire bornée par le bloc ;
+#   - la taille des fichiers de sortie (et de rejets) à la fin du passage.
+# Seules les lignes après le filigrane sont lues, nettoyées et ajoutées à la sortie.
+#
+# Reprise après un arrêt brutal : etat.json est la seule validation d'un passage et il est
+# remplacé atomiquement (fichier temporaire + os.replace). Un passage interrompu a pu
+# ajouter des lignes aux sorties et écrire de nouveaux runs : au passage suivant, les
+# sorties sont tronquées aux tailles validées et seuls les runs cités par l'état sont lus.
+# Les lignes de ce passage sont donc simplement retraitées, sans doublon ni perte.
+
+VERSION_ETAT = 3
+FENETRE_CONTROLE = 64 * 1024  # octets relus avant le filigrane pour vérifier le fichier
+
+
+class _FichierBorne(io.RawIOBase):
+    """Vue en lecture seule d'un fichier, de sa position courante jusqu'à l'octet ``fin``."""
+
+    def __init__(self, f, fin):
+        self.f = f
+        self.fin = fin
+
+    def readable(self):
+        return True
+
+    def readinto(self, tampon):
+        reste = self.fin - self.f.tell()
+        if reste <= 0:
+            return 0
+        return self.f.readinto(memoryview(tampon)[:min(len(tampon), reste)])
+
+
+def _empreinte_fenetre(chemin, fin):
+    debut = max(0, fin - FENETRE_CONTROLE)
+    with open(chemin, 'rb') as f:
+        f.seek(debut)
+        return hashlib.blake2b(f.read(fin - debut), digest_size=16).hexdigest()
+
+
+def _fin_derniere_ligne(chemin, taille):
+    """Position juste après le dernier saut de ligne (une ligne en cours d'écriture est ignorée)."""
+    with open(chemin, 'rb') as f:
+        position = taille
+        while position > 0:
+            debut = max(0, position - FENETRE_CONTROLE)
+            f.seek(debut)
+            morceau = f.read(position - debut)
+            i = morceau.rfind(b'\n')
+            if i >= 0:
+                return debut + i + 1
+            position = debut
+    return 0
+
+
+class IndexEmpreintes:
+    """Ensemble d'empreintes 64 bits sur disque, en runs triés consultés par recherche dichotomique.
+
+    ``noms`` : runs validés (fichiers de ``dossier``). Un run n'est jamais réécrit : ajouts et
+    fusions créent de nouveaux fichiers, ``noms`` est enregistré ensuite dans l'état.
+    """
+
+    def __init__(self, dossier, noms=()):
+        self.dossier = dossier
+        self.noms = list(noms)
+        self.valides = set(self.noms)  # runs cités par l'état : conservés jusqu'à purger()
+        self.runs = [np.load(os.path.join(dossier, nom), mmap_mode='r') for nom in self.noms]
+
+    def contient(self, empreintes):
+        present = np.zeros(len(empreintes), dtype=bool)
+        for run in self.runs:
+            if len(run):
+                i = np.searchsorted(run, empreintes)
+                present |= run[np.minimum(i, len(run) - 1)] == empreintes
+        return present
+
+    def _nouveau_run(self, empreintes):
+        # Numéro libre après tous les fichiers présents (y compris ceux d'un passage interrompu)
+        numeros = [int(nom[len('empreintes_'):-len('.npy')]) for nom in os.listdir(self.dossier)
+                   if nom.startswith('empreintes_') and nom.endswith('.npy')]
+        nom = f'empreintes_{max(numeros, default=-1) + 1:05d}.npy'
+        _ecrire_atomique(os.path.join(self.dossier, nom), lambda f: np.save(f, empreintes))
+        self.noms.append(nom)
+        self.runs.append(np.load(os.path.join(self.dossier, nom), mmap_mode='r'))
+
+    def ajouter(self, empreintes):
+        if not len(empreintes):
+            return
+        self._nouveau_run(np.unique(empreintes))
+        # Comme un compteur binaire : le dernier run absorbe le précédent tant que celui-ci
+        # n'est pas plus grand (chaque empreinte est refusionnée ~log2(n) fois au plus)
+        while len(self.runs) > 1 and len(self.runs[-2]) <= len(self.runs[-1]):
+            fusion = np.union1d(self.runs[-2], self.runs[-1])
+            for nom in self.noms[-2:]:
+                if nom not in self.valides:
+                    os.remove(os.path.join(self.dossier, nom))
+            del self.noms[-2:], self.runs[-2:]
+            self._nouveau_run(fusion)
+
+    def purger(self):
+        """Supprime les runs non cités (anciens runs compactés, restes d'un passage interrompu)."""
+        for nom in os.listdir(self.dossier):
+            if nom.startswith('empreintes_') and nom not in self.noms:
+                os.remove(os.path.join(self.dossier, nom))
+
+
+def _ecrire_atomique(chemin, ecrire):
+    # Un lecteur (ou le passage suivant, après un arrêt brutal) voit l'ancien fichier ou le nouveau
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'wb') as f:
+        ecrire(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporaire, chemin)
+
+
+def _taille(chemin):
+    return os.path.getsize(chemin) if chemin is not None and os.path.exists(chemin) else 0
+
+
+def _lire_etat(dossier_etat):
+    try:
+        with open(os.path.join(dossier_etat, 'etat.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _etat_valide(etat, chemin, regles):
+    if etat is None or etat.get('version') != VERSION_ETAT:
+        return False
+    if etat['regles'] != [nom for nom, _ in regles]:
+        return False
+    taille = os.path.getsize(chemin)
+    if taille < etat['octets']:
+        return False
+    return _empreinte_fenetre(chemin, etat['octets']) == etat['controle']
+
+
+def _restaurer_sorties(etat, chemin_sortie, chemin_rejets):
+    """Tronque les sorties aux tailles validées par ``etat``. Faux si une sortie a été raccourcie."""
+    tailles = etat['sorties']
+    for sortie in (chemin_sortie, chemin_rejets):
+        if sortie is None or os.path.abspath(sortie) not in tailles:
+            continue
+        attendue = tailles[os.path.abspath(sortie)]
+        if _taille(sortie) < attendue:
+            return False
+        if attendue == 0:
+            # Fichier créé par un passage interrompu : il sera recréé avec son en-tête
+            if os.path.exists(sortie):
+                os.remove(sortie)
+        elif _taille(sortie) > attendue:
+            with open(sortie, 'r+b') as f:
+                f.truncate(attendue)
+    return True
+
+
+def nettoyer_clients_incremental(chemin='customers.csv', chemin_sortie='customers_cleaned_final.csv',
+                                 chemin_rejets=None, dossier_etat=None, taille_bloc=TAILLE_BLOC,
+                                 regles=regles_clients, complet=False):
+    """Nettoie uniquement les lignes ajoutées à ``chemin`` depuis le dernier passage.
+
+    Les lignes propres sont ajoutées à ``chemin_sortie`` (et les rejets à ``chemin_rejets``).
+    Si l'état est absent, incohérent (fichier réécrit ou tronqué, règles modifiées)
+    ou si ``complet`` est vrai, tout le fichier est retraité depuis le début.
+    Renvoie le bilan du passage.
+    """
+    if dossier_etat is None:
+        dossier_etat = os.path.splitext(chemin_sortie)[0] + '.etat'
+
+    etat = None if complet else _lire_etat(dossier_etat)
+    if (not _etat_valide(etat, chemin, regles) or not os.path.exists(chemin_sortie)
+            or not _restaurer_sorties(etat, chemin_sortie, chemin_rejets)):
+        # Reconstruction complète : on repart d'un état vide
+        shutil.rmtree(dossier_etat, ignore_errors=True)
+        for sortie in (chemin_sortie, chemin_rejets):
+            if sortie is not None and os.path.exists(sortie):
+                os.remove(sortie)
+        etat = None
+    os.makedirs(dossier_etat, exist_ok=True)
+
+    with open(chemin, 'rb') as f:
+        entete = f.readline()
+    colonnes = pd.read_csv(io.BytesIO(entete), dtype=str).columns.tolist()
+
+    octets_debut = etat['octets'] if etat else len(entete)
+    lignes_debut = etat['lignes'] if etat else 0
+    octets_fin = max(octets_debut, _fin_derniere_ligne(chemin, os.path.getsize(chemin)))
+
+    bilan = {'mode': 'incremental' if etat else 'complet', 'lignes_nouvelles': 0, 'doublons': 0,
+             'lignes_rejetees': 0, 'lignes_finales': 0, 'rejets': {nom: 0 for nom, _ in regles}}
+    index = IndexEmpreintes(dossier_etat, etat['runs'] if etat else ())
+
+    if octets_fin > octets_debut:
+        with open(chemin, 'rb') as f:
+            f.seek(octets_debut)
+            source = io.BufferedReader(_FichierBorne(f, octets_fin))
+            for bloc in pd.read_csv(source, header=None, names=colonnes, dtype=str, chunksize=taille_bloc):
+                bilan['lignes_nouvelles'] += len(bloc)
+
+                empreintes = empreintes_lignes(bloc, colonnes_numeriques(schema_clients))
+                doublon = pd.Series(empreintes).duplicated().to_numpy() | index.contient(empreintes)
+                # Runs non validés tant qu'etat.json ne les cite pas (voir plus bas)
+                index.ajouter(empreintes[~doublon])
+                bilan['doublons'] += int(doublon.sum())
+
+                bloc_propre, bloc_rejete, rejets = separer_clients(bloc[~doublon], regles)
+                for nom, n in rejets.items():
+                    bilan['rejets'][nom] += n
+                bilan['lignes_rejetees'] += len(bloc_rejete)
+                bilan['lignes_finales'] += len(bloc_propre)
+
+                bloc_propre.to_csv(chemin_sortie, mode='a', header=not os.path.exists(chemin_sortie), index=False)
+                if chemin_rejets is not None and len(bloc_rejete):
+                    bloc_rejete.to_csv(chemin_rejets, mode='a', header=not os.path.exists(chemin_rejets), index=False)
+
+    if not os.path.exists(chemin_sortie):
+        # Aucune ligne propre : on crée quand même une sortie avec l'en-tête
+        pd.DataFrame(columns=colonnes).to_csv(chemin_sortie, index=False)
+
+    # Validation du passage : les nouveaux runs sont déjà écrits (fichiers neufs, encore
+    # ignorés) ; etat.json les cite avec les tailles des sorties, en une opération atomique.
+    for sortie in (chemin_sortie, chemin_rejets):
+        if sortie is not None and os.path.exists(sortie):
+            with open(sortie, 'rb') as f:
+                os.fsync(f.fileno())
+
+    etat = {
+        'version': VERSION_ETAT,
+        'source': os.path.abspath(chemin),
+        'regles': [nom for nom, _ in regles],
+        'octets': octets_fin,
+        'lignes': lignes_debut + bilan['lignes_nouvelles'],
+        'controle': _empreinte_fenetre(chemin, octets_fin),
+        'runs': index.noms,
+        'sorties': {os.path.abspath(sortie): _taille(sortie)
+                    for sortie in (chemin_sortie, chemin_rejets) if sortie is not None},
+    }
+    _ecrire_atomique(os.path.join(dossier_etat, 'etat.json'),
+                     lambda f: f.write(json.dumps(etat, indent=2).encode('utf-8')))
+    index.purger()
+
+    bilan['lignes_traitees_total'] = etat['lignes']
+    return bilan
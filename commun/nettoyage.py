@@ -0,0 +1,103 @@
+import os
+
+from commun.doublons import iterer_sans_doublons, BUDGET_MEMOIRE
+from commun.schema import appliquer_schema, colonnes_numeriques, concatener_blocs, schema_clients
+from commun.regles import regles_clients, evaluer_regles, compter_rejets, libeller_violations
+
+# --- PARAMÈTRES DU NETTOYAGE (identiques à script_3_etape.py) ---
+
+# Dictionnaire de remplacement pour standardiser les pays
+country_mapping = {
+    'EIRE': 'Ireland',
+    'RSA': 'South Africa',
+    'West Indies': 'Caribbean',
+    'Channel Islands': 'United Kingdom',
+    'European Community': 'Europe'
+}
+
+# Taille d'un bloc de lecture : la mémoire utilisée ne dépend que de ce nombre de lignes
+TAILLE_BLOC = 100_000
+
+
+def typer_clients(df):
+    """Standardise les pays et applique le schéma de types compacts à un bloc brut."""
+    return appliquer_schema(df.assign(country=df['country'].replace(country_mapping)), schema_clients)
+
+
+def separer_clients(df, regles=regles_clients):
+    """Nettoie un bloc brut de customers.csv (hors doublons).
+
+    Toutes les règles sont évaluées en une passe et combinées en un seul masque.
+    Renvoie ``(propres, rejetes, rejets)`` : les lignes gardées, les lignes rejetées
+    (avec la colonne ``regles_violees``) et le nombre de violations par règle.
+    """
+    df_type = typer_clients(df)
+    valide, violations = evaluer_regles(df_type, regles)
+
+    rejetes = df_type[~valide].assign(regles_violees=libeller_violations(violations[~valide], regles))
+    return df_type[valide], rejetes, compter_rejets(violations, regles)
+
+
+def nettoyer_clients(df, regles=regles_clients):
+    """Version simple de ``separer_clients`` : renvoie uniquement le bloc propre.
+
+    Le nombre de violations par règle est disponible dans ``df_cleaned.attrs['rejets']``.
+    """
+    df_cleaned, _, rejets = separer_clients(df, regles)
+    df_cleaned.attrs['rejets'] = rejets
+    return df_cleaned
+
+
+def iterer_clients_nettoyes(chemin='customers.csv', taille_bloc=TAILLE_BLOC, regles=regles_clients, bilan=None,
+                            chemin_rejets=None, budget_memoire=BUDGET_MEMOIRE):
+    """Lit customers.csv bloc par bloc et produit les blocs nettoyés.
+
+    Les doublons sont supprimés sur toute la longueur du fichier par l'étape hors mémoire
+    de ``commun.doublons`` (empreintes 64 bits, déversées sur disque au-delà du budget).
+    Si ``bilan`` (dict) est fourni, il est complété avec les compteurs de lignes.
+    Si ``chemin_rejets`` est fourni, les lignes rejetées par les règles y sont écrites.
+    """
+    if bilan is None:
+        bilan = {}
+    bilan.update({'lignes_rejetees': 0, 'lignes_finales': 0, 'rejets': {nom: 0 for nom, _ in regles}})
+    if chemin_rejets is not None and os.path.exists(chemin_rejets):
+        os.remove(chemin_rejets)
+
+    # dtype=str : les empreintes ne dépendent pas des types devinés bloc par bloc ; les
+    # colonnes numériques du schéma sont comparées par valeur (comme drop_duplicates après read_csv)
+    for bloc in iterer_sans_doublons(chemin, taille_bloc=taille_bloc, budget_memoire=budget_memoire,
+                                     bilan=bilan, numeriques=colonnes_numeriques(schema_clients), dtype=str):
+        bloc_propre, bloc_rejete, rejets = separer_clients(bloc, regles)
+        for nom, n in rejets.items():
+            bilan['rejets'][nom] += n
+        bilan['lignes_rejetees'] += len(bloc_rejete)
+        bilan['lignes_finales'] += len(bloc_propre)
+
+        if chemin_rejets is not None and len(bloc_rejete):
+            bloc_rejete.to_csv(chemin_rejets, mode='a', header=not os.path.exists(chemin_rejets), index=False)
+
+        yield bloc_propre
+
+
+def charger_clients(chemin='customers.csv', taille_bloc=TAILLE_BLOC, colonnes=None, regles=regles_clients):
+    """Renvoie la table clients nettoyée complète (éventuellement réduite à ``colonnes``)."""
+    blocs = []
+    for bloc in iterer_clients_nettoyes(chemin, taille_bloc=taille_bloc, regles=regles):
+        blocs.append(bloc if colonnes is None else bloc[colonnes])
+    return concatener_blocs(blocs)
+
+
+def ecrire_clients_nettoyes(chemin='customers.csv', chemin_sortie='customers_cleaned_final.csv',
+                            taille_bloc=TAILLE_BLOC, regles=regles_clients, chemin_rejets=None):
+    """Nettoie customers.csv en flux et écrit le résultat bloc par bloc. Renvoie le bilan."""
+    bilan = {}
+    if os.path.exists(chemin_sortie):
+        os.remove(chemin_sortie)
+
+    premier = True
+    for bloc in iterer_clients_nettoyes(chemin, taille_bloc=taille_bloc, regles=regles, bilan=bilan,
+                                        chemin_rejets=chemin_rejets):
+        bloc.to_csv(chemin_sortie, mode='w' if premier else 'a', header=premier, index=False)
+        premier = False
+
+    return bilan
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+
+from commun.segmentation import PARAMETRES_KMEANS, echantillon_stratifie
+
+# --- CHOIX DU NOMBRE DE CLUSTERS ---
+# Chaque valeur de k est ajustée (K-Means, mêmes paramètres que la segmentation) dans
+# un processus séparé. L'inertie est calculée sur toute la base ; la silhouette, en
+# O(n²), sur un échantillon de taille fixe stratifié par cellule RFM (chaque cellule y
+# garde son poids dans la base). Les cœurs sont partagés entre les processus : chacun
+# limite ses threads OpenMP / BLAS (K-Means, silhouette) à cœurs // processus, sinon
+# chaque K-Means lancerait un thread par cœur (cœurs x processus threads au total).
+# Les k sont lancés du plus petit au plus grand : si le budget de temps est épuisé, les
+# calculs en cours sont arrêtés et les k manquants apparaissent vides dans le tableau.
+
+TAILLE_ECHANTILLON = 10_000
+BUDGET = 300  # secondes
+
+
+_X = None
+_echantillon = None
+_limites = None
+
+
+def _initialiser(X, echantillon, threads):
+    from threadpoolctl import threadpool_limits
+
+    global _X, _echantillon, _limites
+    _X, _echantillon = X, echantillon
+    _limites = threadpool_limits(threads)  # pour toute la vie du processus
+
+
+def _evaluer(k):
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    debut = time.perf_counter()
+    kmeans = KMeans(**{**PARAMETRES_KMEANS, 'n_clusters': k}).fit(_X)
+    silhouette = silhouette_score(_X[_echantillon], kmeans.labels_[_echantillon])
+    return {'k': k, 'inertie': kmeans.inertia_, 'silhouette': silhouette, 'duree': time.perf_counter() - debut}
+
+
+def evaluer_k(X, strates, ks=range(2, 11), taille_echantillon=TAILLE_ECHANTILLON, processus=None, budget=BUDGET):
+    """Inertie et silhouette (sur échantillon) de K-Means pour chaque k de ``ks``.
+
+    ``X`` : variables standardisées ; ``strates`` : strate de chaque ligne (ex. RFM_Code).
+    Renvoie un DataFrame indexé par k ; les k non terminés dans ``budget`` secondes sont vides.
+    """
+    ks = sorted(ks)
+    echantillon = echantillon_stratifie(strates, taille_echantillon)
+    coeurs = os.cpu_count() or 1
+    processus = min(processus or coeurs, len(ks))
+    threads = max(1, coeurs // processus)
+    fin = time.monotonic() + budget
+
+    resultats = []
+    with multiprocessing.Pool(processus, initializer=_initialiser, initargs=(X, echantillon, threads)) as pool:
+        en_cours = [pool.apply_async(_evaluer, (k,)) for k in ks]
+        for resultat in en_cours:
+            reste = fin - time.monotonic()
+            if reste <= 0:
+                break
+            try:
+                resultats.append(resultat.get(timeout=reste))
+            except multiprocessing.TimeoutError:
+                break
+        # La sortie du bloc arrête (terminate) les ajustements encore en cours
+
+    tableau = pd.DataFrame(resultats, columns=['k', 'inertie', 'silhouette', 'duree']).set_index('k')
+    return tableau.reindex(ks)
+
+
+def dessiner_coude(tableau, chemin):
+    """Courbe du coude (inertie) et silhouette par k, sur deux axes."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from commun.graphiques import habiller_axes
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(tableau.index, tableau['inertie'], marker='o', color='purple', linewidth=2, label='Inertie')
+    ax.set_xlabel("Nombre de clusters (k)", fontsize=12, color='purple')
+    ax.set_ylabel("Inertie (somme des distances²)", fontsize=12, color='purple')
+    habiller_axes(ax)
+
+    ax2 = ax.twinx()
+    ax2.plot(tableau.index, tableau['silhouette'], marker='s', color='hotpink', linewidth=2, label='Silhouette')
+    ax2.set_ylabel("Silhouette (échantillon)", fontsize=12, color='hotpink')
+    habiller_axes(ax2, grille=False)
+
+    lignes = ax.get_lines() + ax2.get_lines()
+    ax.legend(lignes, [ligne.get_label() for ligne in lignes], labelcolor='purple', edgecolor='purple')
+    ax.set_xticks(tableau.index)
+    plt.title("Choix du nombre de clusters : méthode du coude et silhouette",
+              fontsize=15, pad=15, color='purple', fontweight='bold')
+    plt.savefig(chemin, bbox_inches='tight', dpi=150)
+    plt.close()
@@ -0,0 +1,150 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from commun.rfm import cols_rfm
+from commun.segmentation import N_CLUSTERS, noms_clusters
+
+# --- PROFILS DES SEGMENTS : UNE TABLE PAR CLUSTER ---
+# Toutes les statistiques des graphiques de segments sont calculées en un passage sur
+# les clients, avec des codes entiers (cluster, pays) et np.bincount : effectifs,
+# moyennes RFM, quartiles et moustaches de l'ancienneté (un seul tri cluster x valeur),
+# parts des TOP_PAYS pays principaux. Les graphiques ne lisent ensuite que cette table
+# (une ligne par cluster), plus jamais les lignes clients.
+#
+# La table est enregistrée sous .cache/ (profils-<empreinte>.parquet, ou .pkl sans
+# pyarrow), sous l'empreinte du modèle de segmentation et des colonnes ancienneté / pays :
+# tant qu'elles ne changent pas, elle est relue sans recalculer les segments.
+
+VERSION_PROFILS = 1
+TOP_PAYS = 4
+MAX_ATYPIQUES = 200  # valeurs atypiques d'ancienneté gardées par cluster (pour le boxplot)
+
+
+def _quantile_trie(valeurs, q):
+    # Interpolation linéaire, comme np.percentile, sur des valeurs déjà triées
+    position = q * (len(valeurs) - 1)
+    bas = int(np.floor(position))
+    haut = min(bas + 1, len(valeurs) - 1)
+    return valeurs[bas] + (position - bas) * (valeurs[haut] - valeurs[bas])
+
+
+def _boite(valeurs, max_atypiques):
+    # Statistiques d'un boxplot (moustaches à 1.5 x l'écart interquartile, comme matplotlib)
+    if not len(valeurs):
+        return {'Anc_q1': np.nan, 'Anc_mediane': np.nan, 'Anc_q3': np.nan,
+                'Anc_moustache_basse': np.nan, 'Anc_moustache_haute': np.nan, 'Anc_atypiques': ()}
+    q1, mediane, q3 = (_quantile_trie(valeurs, q) for q in (0.25, 0.5, 0.75))
+    ecart = q3 - q1
+    debut = np.searchsorted(valeurs, q1 - 1.5 * ecart, side='left')
+    fin = np.searchsorted(valeurs, q3 + 1.5 * ecart, side='right')
+    atypiques = np.concatenate([valeurs[:debut], valeurs[fin:]])
+    if len(atypiques) > max_atypiques:
+        # Valeurs réparties sur toute l'étendue des atypiques (les extrêmes sont gardés)
+        atypiques = atypiques[np.linspace(0, len(atypiques) - 1, max_atypiques).round().astype(int)]
+    return {'Anc_q1': q1, 'Anc_mediane': mediane, 'Anc_q3': q3,
+            'Anc_moustache_basse': valeurs[debut], 'Anc_moustache_haute': valeurs[fin - 1],
+            'Anc_atypiques': tuple(atypiques.tolist())}
+
+
+def resumer_clusters(df, n_clusters=N_CLUSTERS, top_pays=TOP_PAYS, max_atypiques=MAX_ATYPIQUES):
+    """Table des segments (une ligne par cluster, index Nom_Cluster).
+
+    ``df`` : colonnes Cluster, variables RFM, tenure_days et country. Colonnes produites :
+    Effectif et moyennes RFM ; sur les clients dont l'ancienneté et le pays sont connus,
+    Effectif_Profil, quartiles / moustaches / atypiques de l'ancienneté (Anc_*) et part
+    en % de chaque pays principal et des autres (Pays_*).
+    """
+    clusters = df['Cluster'].to_numpy(np.int64)
+    effectifs = np.bincount(clusters, minlength=n_clusters)
+    table = pd.DataFrame({'Cluster': np.arange(n_clusters), 'Effectif': effectifs},
+                         index=pd.Index([noms_clusters.get(i, f'C{i}') for i in range(n_clusters)], name='Nom_Cluster'))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for col in cols_rfm:
+            table[col] = np.bincount(clusters, weights=df[col].to_numpy(np.float64), minlength=n_clusters) / effectifs
+
+    # Profil démographique : clients dont l'ancienneté et le pays sont connus
+    anciennete = df['tenure_days'].to_numpy(np.float64)
+    codes_pays, pays = pd.factorize(df['country'])
+    profil = ~np.isnan(anciennete) & (codes_pays >= 0)
+    clusters, anciennete, codes_pays = clusters[profil], anciennete[profil], codes_pays[profil]
+    effectifs_profil = np.bincount(clusters, minlength=n_clusters)
+    table['Effectif_Profil'] = effectifs_profil
+
+    # Ancienneté : un seul tri (cluster, valeur), chaque cluster est ensuite une tranche
+    anciennete = anciennete[np.lexsort((anciennete, clusters))]
+    fins = np.cumsum(effectifs_profil)
+    boites = [_boite(anciennete[fin - n:fin], max_atypiques) for n, fin in zip(effectifs_profil, fins)]
+    for cle in boites[0]:
+        table[cle] = [boite[cle] for boite in boites]
+
+    # Pays : tableau croisé cluster x pays, pays principaux + "Autres", en % du cluster
+    croise = np.bincount(clusters * len(pays) + codes_pays,
+                         minlength=n_clusters * len(pays)).reshape(n_clusters, len(pays))
+    principaux = np.argsort(-croise.sum(axis=0), kind='stable')[:top_pays]
+    parts = {str(pays[j]): croise[:, j] for j in principaux}
+    autres = effectifs_profil - croise[:, principaux].sum(axis=1)
+    if autres.any():
+        parts['Autres'] = autres
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for nom in sorted(parts):
+            table[f'Pays_{nom}'] = parts[nom] / effectifs_profil * 100
+    return table
+
+
+def empreinte_profils(empreinte_segmentation, empreintes_colonnes, top_pays=TOP_PAYS, max_atypiques=MAX_ATYPIQUES):
+    """Empreinte de la table : modèle de segmentation + colonnes ancienneté / pays + paramètres."""
+    h = hashlib.blake2b(f'v{VERSION_PROFILS}-{empreinte_segmentation}'.encode(), digest_size=16)
+    for colonne in empreintes_colonnes:
+        h.update(colonne.encode())
+    h.update(f'top_pays={top_pays!r} max_atypiques={max_atypiques!r}'.encode())
+    return h.hexdigest()
+
+
+def ecrire_resume(table, chemin):
+    """Enregistre la table des segments (parquet, pickle ou CSV selon l'extension de ``chemin``).
+
+    En CSV, les valeurs atypiques d'ancienneté sont écrites séparées par des espaces.
+    """
+    extension = os.path.splitext(chemin)[1]
+    temporaire = chemin + '.tmp'
+    if extension == '.parquet':
+        table.assign(Anc_atypiques=table['Anc_atypiques'].map(list)).to_parquet(temporaire, engine='pyarrow')
+    elif extension == '.pkl':
+        table.to_pickle(temporaire, compression=None)
+    else:
+        atypiques = table['Anc_atypiques'].map(lambda valeurs: ' '.join(map(str, valeurs)))
+        table.assign(Anc_atypiques=atypiques).to_csv(temporaire)
+    os.replace(temporaire, chemin)
+
+
+def lire_resume(chemin):
+    """Table des segments écrite par ``ecrire_resume``."""
+    extension = os.path.splitext(chemin)[1]
+    if extension == '.parquet':
+        table = pd.read_parquet(chemin)
+    elif extension == '.pkl':
+        return pd.read_pickle(chemin, compression=None)
+    else:
+        table = pd.read_csv(chemin, index_col='Nom_Cluster', keep_default_na=False,
+                            na_values={col: [''] for col in ('Anc_q1', 'Anc_mediane', 'Anc_q3',
+                                                             'Anc_moustache_basse', 'Anc_moustache_haute')})
+        table['Anc_atypiques'] = table['Anc_atypiques'].map(str.split)
+    table['Anc_atypiques'] = table['Anc_atypiques'].map(lambda valeurs: tuple(float(v) for v in valeurs))
+    return table
+
+
+def resume_clusters_cache(empreinte, dossier_cache, calculer):
+    """Table enregistrée sous ``empreinte`` dans ``dossier_cache`` ; si elle manque, ``calculer()``
+    la construit et elle est enregistrée."""
+    from commun.cache import HAS_PYARROW
+
+    chemin = os.path.join(dossier_cache, f'profils-{empreinte}' + ('.parquet' if HAS_PYARROW else '.pkl'))
+    if os.path.exists(chemin):
+        return lire_resume(chemin)
+    table = calculer()
+    os.makedirs(dossier_cache, exist_ok=True)
+    ecrire_resume(table, chemin)
+    return table
@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from commun.segmentation import echantillon_stratifie
+
+# --- PROJECTION 2D (UMAP / t-SNE) D'UNE GRANDE BASE ---
+# UMAP, et surtout t-SNE (sans transform() pour de nouveaux points), ne passent pas à
+# l'échelle de la base entière. La projection est apprise sur un échantillon stratifié
+# par cluster (TAILLE_APPRENTISSAGE clients au plus) ; chaque autre client est placé à
+# la moyenne des positions de ses VOISINS plus proches voisins de l'échantillon (dans
+# l'espace standardisé), pondérée par l'inverse de la distance.
+# Le placement se fait par blocs, en parallèle sur des threads (la recherche dans le
+# KD-tree libère le GIL). Jusqu'à TAILLE_APPRENTISSAGE clients, tout est appris :
+# la projection est alors celle de la base entière.
+
+TAILLE_APPRENTISSAGE = 10_000
+VOISINS = 10
+TAILLE_BLOC = 100_000
+
+
+def placer(X, X_appris, Y_appris, voisins=VOISINS, taille_bloc=TAILLE_BLOC, processus=None):
+    """Position 2D de chaque ligne de ``X`` : moyenne pondérée (1 / distance) des positions
+    ``Y_appris`` de ses ``voisins`` plus proches voisins dans ``X_appris``."""
+    from sklearn.neighbors import KDTree
+
+    arbre = KDTree(X_appris)
+    voisins = min(voisins, len(X_appris))
+
+    def placer_bloc(debut):
+        distances, indices = arbre.query(X[debut:debut + taille_bloc], k=voisins)
+        poids = 1 / np.maximum(distances, 1e-12)  # un point déjà appris garde sa position
+        poids /= poids.sum(axis=1, keepdims=True)
+        return np.einsum('nk,nkd->nd', poids, Y_appris[indices])
+
+    with ThreadPoolExecutor(processus or os.cpu_count() or 1) as pool:
+        return np.concatenate(list(pool.map(placer_bloc, range(0, len(X), taille_bloc))))
+
+
+def projeter(X, strates, ajuster, taille=TAILLE_APPRENTISSAGE, voisins=VOISINS, processus=None):
+    """Projection 2D de ``X`` : ``ajuster(X_echantillon)`` (ex. UMAP().fit_transform) sur un
+    échantillon stratifié par ``strates``, puis placement des autres lignes par voisinage."""
+    echantillon = echantillon_stratifie(strates, taille)
+    Y = np.empty((len(X), 2))
+    Y[echantillon] = ajuster(X[echantillon])
+
+    reste = np.ones(len(X), dtype=bool)
+    reste[echantillon] = False
+    if reste.any():
+        Y[reste] = placer(X[reste], X[echantillon], Y[echantillon], voisins, processus=processus)
+    return Y
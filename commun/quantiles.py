@@ -0,0 +1,183 @@
+import numpy as np
+
+# --- RÉSUMÉ DE QUANTILES EN FLUX (t-digest) ---
+# Une colonne est résumée par quelques centaines de centroïdes (moyenne, poids), fins
+# aux extrémités de la distribution et larges au centre : les quantiles extrêmes
+# (95e percentile) restent précis. Le résumé se remplit bloc par bloc et deux résumés
+# (deux blocs, deux partitions, deux fichiers) se fusionnent : la colonne n'a jamais
+# besoin d'être entièrement en mémoire, ni triée.
+# Tant que la colonne compte peu de valeurs distinctes (jours, nombres de commandes),
+# le résumé garde chaque valeur avec son effectif : les quantiles sont alors exacts.
+
+COMPRESSION = 500       # au plus ~COMPRESSION / 2 centroïdes
+LIMITE_EXACTE = 4096    # nombre de valeurs distinctes gardées telles quelles
+
+
+class ResumeQuantiles:
+    """Résumé fusionnable d'une distribution numérique (t-digest, fonction d'échelle k1)."""
+
+    def __init__(self, compression=COMPRESSION):
+        self.compression = compression
+        self.moyennes = np.empty(0)
+        self.poids = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self.exact = True  # chaque centroïde est encore une valeur distincte
+
+    @property
+    def n(self):
+        return float(self.poids.sum())
+
+    def ajouter(self, valeurs):
+        """Ajoute un bloc de valeurs (les valeurs vides sont ignorées)."""
+        valeurs = np.asarray(valeurs, dtype=np.float64)
+        valeurs = valeurs[~np.isnan(valeurs)]
+        if len(valeurs):
+            self._compresser(np.concatenate([self.moyennes, valeurs]),
+                             np.concatenate([self.poids, np.ones(len(valeurs))]))
+            self.min = min(self.min, valeurs.min())
+            self.max = max(self.max, valeurs.max())
+        return self
+
+    def fusionner(self, autre):
+        """Ajoute à ce résumé toutes les valeurs résumées par ``autre``."""
+        if len(autre.poids):
+            # Les centroïdes d'un résumé approché ne sont pas des valeurs : le résultat l'est aussi
+            self.exact = self.exact and autre.exact
+            self._compresser(np.concatenate([self.moyennes, autre.moyennes]),
+                             np.concatenate([self.poids, autre.poids]))
+            self.min = min(self.min, autre.min)
+            self.max = max(self.max, autre.max)
+        return self
+
+    def _compresser(self, moyennes, poids):
+        if self.exact:
+            valeurs, groupe = np.unique(moyennes, return_inverse=True)
+            if len(valeurs) <= LIMITE_EXACTE:
+                self.moyennes = valeurs
+                self.poids = np.bincount(groupe, weights=poids)
+                return
+            self.exact = False
+
+        # Ordre total (valeur, poids) : le résultat ne dépend pas de l'ordre des deux résumés
+        ordre = np.lexsort((poids, moyennes))
+        moyennes, poids = moyennes[ordre], poids[ordre]
+
+        # Position (quantile) du bord gauche de chaque centroïde, sur l'échelle k1 :
+        # les centroïdes sont regroupés par unité de k (groupes étroits près de 0 et de 1)
+        cumul = np.cumsum(poids)
+        q_gauche = (cumul - poids) / cumul[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_gauche - 1)
+        groupe = np.floor(k).astype(np.int64)
+        groupe -= groupe[0]
+
+        poids_groupes = np.bincount(groupe, weights=poids)
+        sommes_groupes = np.bincount(groupe, weights=moyennes * poids)
+        non_vides = poids_groupes > 0
+        self.poids = poids_groupes[non_vides]
+        self.moyennes = sommes_groupes[non_vides] / self.poids
+
+    def _points(self):
+        # Courbe (rang cumulé, valeur) passant par le centre de chaque centroïde
+        cumul = np.cumsum(self.poids)
+        rangs = np.concatenate([[0.0], cumul - self.poids / 2, [cumul[-1]]])
+        valeurs = np.concatenate([[self.min], self.moyennes, [self.max]])
+        return rangs, valeurs
+
+    def quantile(self, q):
+        """Quantile(s) approché(s) d'ordre ``q`` (entre 0 et 1)."""
+        if not len(self.poids):
+            return np.nan
+        if self.exact:
+            # Même définition que pandas : interpolation entre les deux valeurs encadrantes
+            cumul = np.cumsum(self.poids)
+            position = np.asarray(q, dtype=np.float64) * (cumul[-1] - 1)
+            bas = self.moyennes[np.searchsorted(cumul, np.floor(position), side='right')]
+            haut = self.moyennes[np.minimum(np.searchsorted(cumul, np.ceil(position), side='right'),
+                                            len(cumul) - 1)]
+            return bas + (position - np.floor(position)) * (haut - bas)
+        rangs, valeurs = self._points()
+        return np.interp(np.asarray(q, dtype=np.float64) * rangs[-1], rangs, valeurs)
+
+    def rang(self, valeur):
+        """Nombre approché de valeurs inférieures ou égales à ``valeur``."""
+        if not len(self.poids):
+            return 0.0
+        if self.exact:
+            cumul = np.concatenate([[0.0], np.cumsum(self.poids)])
+            return cumul[np.searchsorted(self.moyennes, valeur, side='right')]
+        rangs, valeurs = self._points()
+        return np.interp(valeur, valeurs, rangs)
+
+    def histogramme(self, bords):
+        """Nombre (approché) de valeurs par intervalle de ``bords``, découpés comme np.histogram."""
+        bords = np.asarray(bords, dtype=np.float64)
+        if self.exact:
+            return np.histogram(self.moyennes, bords, weights=self.poids)[0]
+        return np.diff(self.rang(bords))
+
+    def moyenne_sous(self, seuil):
+        """Moyenne (approchée) des valeurs inférieures ou égales à ``seuil``."""
+        if self.exact:
+            sous = self.moyennes <= seuil
+            return np.average(self.moyennes[sous], weights=self.poids[sous])
+        # Somme cumulée des valeurs, interpolée au rang du seuil comme les quantiles
+        rangs, valeurs = self._points()
+        masses = self.moyennes * self.poids
+        sommes = np.concatenate([[0.0], np.cumsum(masses) - masses / 2, [masses.sum()]])
+        rang = self.rang(seuil)
+        return np.interp(rang, rangs, sommes) / rang
+
+
+def distribution_tronquee(resume, bins, q=0.95):
+    """Histogramme des valeurs sous le quantile ``q`` : (comptes, bords, moyenne, médiane).
+
+    Même découpage que plt.hist sur la colonne filtrée (``bins`` intervalles égaux entre
+    la plus petite et la plus grande valeur gardée) ; la médiane est celle des valeurs gardées.
+    """
+    seuil = float(resume.quantile(q))
+    fin = seuil
+    if resume.exact:
+        fin = resume.moyennes[np.searchsorted(resume.moyennes, seuil, side='right') - 1]
+    bords = np.linspace(resume.min, fin, bins + 1)
+    gardees = resume.rang(seuil)
+    mediane = float(resume.quantile((gardees - 1) / 2 / (resume.n - 1))) if resume.n > 1 else resume.min
+    return resume.histogramme(bords), bords, float(resume.moyenne_sous(seuil)), mediane
+
+
+def resumer_colonnes(blocs, colonnes, compression=COMPRESSION):
+    """Un résumé par colonne, rempli au fil des blocs (DataFrames) produits par ``blocs``."""
+    resumes = {col: ResumeQuantiles(compression) for col in colonnes}
+    for bloc in blocs:
+        for col in colonnes:
+            resumes[col].ajouter(bloc[col].to_numpy(dtype=np.float64, na_value=np.nan))
+    return resumes
+
+
+def verifier_fusion(valeurs, coupure, q=(0.5, 0.95, 0.99), compression=COMPRESSION):
+    """Quantiles de ``valeurs`` coupées en deux résumés a (``coupure`` premières valeurs) et b.
+
+    Renvoie (a fusionné avec b, b fusionné avec a, quantiles exacts) : les deux premiers
+    doivent être identiques, la fusion ne dépend pas de l'ordre.
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    resultats = []
+    for premier, second in ((valeurs[:coupure], valeurs[coupure:]), (valeurs[coupure:], valeurs[:coupure])):
+        fusion = ResumeQuantiles(compression).ajouter(premier)
+        resultats.append(fusion.fusionner(ResumeQuantiles(compression).ajouter(second)).quantile(q))
+    return resultats[0], resultats[1], np.nanquantile(valeurs, q)
+
+
+if __name__ == '__main__':
+    # Exemple : python -m commun.quantiles transactions.csv
+    # Chaque colonne numérique est coupée en un petit résumé (souvent exact) et un grand
+    import sys
+
+    import pandas as pd
+
+    chemin = sys.argv[1] if len(sys.argv) > 1 else 'transactions.csv'
+    df = pd.read_csv(chemin).select_dtypes('number')
+    for col in df.columns:
+        ab, ba, exacts = verifier_fusion(df[col].to_numpy(np.float64), coupure=LIMITE_EXACTE // 2)
+        print(f"{col:>16} | a+b {np.round(ab, 2)} | b+a {np.round(ba, 2)} | exact {np.round(exacts, 2)}"
+              f" | identiques : {np.array_equal(ab, ba)}")
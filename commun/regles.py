@@ -0,0 +1,58 @@
+import numpy as np
+
+# --- REGISTRE DES RÈGLES DE VALIDATION (table clients) ---
+# Chaque règle renvoie le masque des lignes VALIDES ; les valeurs vides sont tolérées
+# (une règle ne rejette une ligne que si elle peut réellement être vérifiée).
+
+
+def regle_pays(df):
+    # Suppression des pays inconnus ("Unspecified")
+    return df['country'] != 'Unspecified'
+
+
+def regle_dates(df):
+    # first_purchase <= last_purchase
+    return (df['first_purchase'] <= df['last_purchase']) | df['first_purchase'].isna() | df['last_purchase'].isna()
+
+
+def regle_recence(df):
+    # recency_days <= tenure_days
+    return (df['recency_days'] <= df['tenure_days']) | df['recency_days'].isna() | df['tenure_days'].isna()
+
+
+def regle_montants(df):
+    # total_spent >= avg_basket
+    return (df['total_spent'] >= df['avg_basket']) | df['total_spent'].isna() | df['avg_basket'].isna()
+
+
+# Ajouter une règle = ajouter une ligne ici : le nettoyage reste une seule passe
+regles_clients = [
+    ('pays', regle_pays),
+    ('dates', regle_dates),
+    ('recence', regle_recence),
+    ('montants', regle_montants),
+]
+
+
+def evaluer_regles(df, regles=regles_clients):
+    """Évalue toutes les règles en une passe vectorisée.
+
+    Renvoie ``(valide, violations)`` : ``valide`` est le masque combiné des lignes à garder,
+    ``violations`` une matrice booléenne (lignes x règles) des règles non respectées.
+    """
+    violations = np.empty((len(df), len(regles)), dtype=bool)
+    for j, (nom, regle) in enumerate(regles):
+        violations[:, j] = ~np.asarray(regle(df), dtype=bool)
+    valide = ~violations.any(axis=1)
+    return valide, violations
+
+
+def compter_rejets(violations, regles=regles_clients):
+    """Nombre de lignes qui violent chaque règle (une ligne peut en violer plusieurs)."""
+    return {nom: int(n) for (nom, _), n in zip(regles, violations.sum(axis=0))}
+
+
+def libeller_violations(violations, regles=regles_clients):
+    """Pour chaque ligne, la liste des règles violées sous forme de texte ('dates|recence')."""
+    noms = np.array([nom for nom, _ in regles], dtype=object)
+    return np.array(['|'.join(noms[ligne]) for ligne in violations], dtype=object)
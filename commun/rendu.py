@@ -0,0 +1,306 @@
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property
+
+import pandas as pd
+
+from commun.rfm import CubeRFM, cols_rfm, noms_rfm, scorer_rfm
+
+# --- RENDU GROUPÉ DES GRAPHIQUES ---
+# Les données sont chargées et nettoyées une seule fois, les intermédiaires partagés
+# (scores RFM, clusters, résumés de quantiles) calculés une seule fois, puis chaque
+# graphique est dessiné dans un pool de processus (backend Agg, sans affichage).
+# Chaque processus reçoit les données préparées une fois, à son démarrage.
+#
+# Cache adressé par contenu : l'empreinte d'un graphique combine le contenu des colonnes
+# sources qu'il déclare (registre GRAPHIQUES), ses paramètres et le code de rendu.
+# Une image déjà produite pour cette empreinte est recopiée au lieu d'être redessinée.
+
+
+class Donnees:
+    """Données partagées par les graphiques, calculées à la demande puis conservées."""
+
+    def __init__(self, chemin_clients='customers.csv', chemin_transactions='transactions.csv', mode_nuage='auto',
+                 segmentation='complet'):
+        self.chemin_clients = chemin_clients
+        self.chemin_transactions = chemin_transactions
+        # Nuages de points : 'points', 'densite' (grille 2D) ou 'auto' (densité au-delà de SEUIL_DENSITE)
+        self.mode_nuage = mode_nuage
+        # K-Means : 'complet' (toute la base en mémoire) ou 'flux' (mini-lots, bloc par bloc)
+        self.segmentation = segmentation
+
+    @cached_property
+    def clients(self):
+        from commun.cache import charger_clients_cache
+        return charger_clients_cache(chemin=self.chemin_clients)
+
+    def blocs(self, source, colonnes):
+        """Blocs de ``colonnes`` de la source : lus en flux depuis le cache si la table clients
+        n'est pas déjà chargée, sinon un seul bloc en mémoire."""
+        if source == 'clients' and 'clients' not in self.__dict__:
+            from commun.cache import iterer_clients_cache
+            return iterer_clients_cache(colonnes, chemin=self.chemin_clients)
+        return [getattr(self, source)[colonnes]]
+
+    def blocs_rfm(self):
+        """Blocs des variables RFM (noms français, sans valeur manquante), lus en flux."""
+        for bloc in self.blocs('clients', list(noms_rfm)):
+            yield bloc.rename(columns=noms_rfm).dropna(subset=cols_rfm)
+
+    @cached_property
+    def resumes(self):
+        # Résumés de quantiles (95e percentile, médiane, histogramme) remplis bloc par bloc,
+        # sans garder ni trier les colonnes entières. Pas d'ancienneté négative (erreur CRM).
+        from commun.quantiles import resumer_colonnes
+        colonnes = ['total_spent', 'avg_basket', 'n_orders', 'recency_days', 'tenure_days']
+        blocs = (bloc.assign(tenure_days=bloc['tenure_days'].where(bloc['tenure_days'] >= 0))
+                 for bloc in self.blocs('clients', colonnes))
+        return resumer_colonnes(blocs, colonnes)
+
+    @cached_property
+    def base_rfm(self):
+        return self.clients[list(noms_rfm)].rename(columns=noms_rfm).dropna(subset=cols_rfm)
+
+    @cached_property
+    def rfm(self):
+        # Scores par quintiles (int8) et cellule RFM (111 à 555)
+        return scorer_rfm(self.base_rfm)
+
+    @cached_property
+    def cube(self):
+        # Cube R x F x M (effectifs, montants) : segments et matrices RFM sans la table clients
+        return CubeRFM(self.rfm)
+
+    def dossier_cache(self):
+        return os.path.join(os.path.dirname(os.path.abspath(self.chemin_clients)), '.cache')
+
+    @cached_property
+    def empreinte_segmentation(self):
+        from commun.segmentation import empreinte_segmentation
+        return empreinte_segmentation([self.empreinte_colonne('clients', col) for col in noms_rfm],
+                                      mode=self.segmentation)
+
+    @cached_property
+    def modele_segmentation(self):
+        # Ajusté une seule fois pour ces colonnes RFM, puis relu depuis .cache/ par tous les scripts
+        from commun.segmentation import ModeleSegmentation, modele_segmentation
+        if self.segmentation == 'flux':
+            return modele_segmentation(self.empreinte_segmentation, self.dossier_cache(),
+                                       lambda e: ModeleSegmentation.ajuster_en_flux(self.blocs_rfm, e))
+        return modele_segmentation(self.empreinte_segmentation, self.dossier_cache(),
+                                   lambda e: ModeleSegmentation.ajuster(self.base_rfm, e))
+
+    @cached_property
+    def rfm_standardise(self):
+        return self.modele_segmentation.standardiser(self.base_rfm)
+
+    @cached_property
+    def segments(self):
+        from commun.segmentation import noms_clusters
+
+        df = self.base_rfm.copy()
+        df['Cluster'] = self.modele_segmentation.predire(self.rfm_standardise)
+        df['Nom_Cluster'] = df['Cluster'].map(noms_clusters)
+        return df
+
+    @cached_property
+    def resume_clusters(self):
+        # Une ligne par segment : moyennes, quartiles d'ancienneté, parts des pays. Relue
+        # depuis .cache/ si elle existe pour ces colonnes : ni segments ni lignes clients
+        from commun.profils import empreinte_profils, resume_clusters_cache, resumer_clusters
+        profils = ['tenure_days', 'country']
+        empreinte = empreinte_profils(self.empreinte_segmentation,
+                                      [self.empreinte_colonne('clients', col) for col in profils])
+        return resume_clusters_cache(empreinte, self.dossier_cache(),
+                                     lambda: resumer_clusters(self.segments.join(self.clients[profils])))
+
+    @cached_property
+    def transactions(self):
+        from commun.transactions import charger_transactions
+        return charger_transactions(self.chemin_transactions,
+                                    colonnes=['invoice_id', 'customer_id', 'product_code', 'invoice_date'])
+
+    @cached_property
+    def promotions(self):
+        # Part des articles achetés en période de promotion (novembre, décembre) par client
+        df_trans = self.transactions
+        promo = df_trans['invoice_date'].dt.month.isin([11, 12])
+        total_items = df_trans.groupby('customer_id')['invoice_id'].count()
+        promo_items = df_trans[promo].groupby('customer_id')['invoice_id'].count()
+        promo_items = promo_items.reindex(total_items.index, fill_value=0)
+        return pd.DataFrame({'total_items': total_items, 'promo_items': promo_items,
+                             'promo_percentage': promo_items / total_items * 100}).reset_index()
+
+    @cached_property
+    def articles(self):
+        # Nombre de codes produits distincts achetés par client
+        df_trans = self.transactions.dropna(subset=['product_code'])
+        return (df_trans.groupby('customer_id', observed=True)['product_code'].nunique()
+                .rename('n_categories').reset_index())
+
+    def empreinte_colonne(self, source, colonne):
+        """Empreinte (blake2b) du contenu d'une colonne source, calculée une seule fois."""
+        cache = self.__dict__.setdefault('_empreintes', {})
+        if (source, colonne) not in cache:
+            h = hashlib.blake2b(digest_size=16)
+            for bloc in self.blocs(source, [colonne]):
+                h.update(pd.util.hash_pandas_object(bloc[colonne], index=False).to_numpy().tobytes())
+            cache[source, colonne] = h.hexdigest()
+        return cache[source, colonne]
+
+    def preparer(self, besoins):
+        """Calcule les intermédiaires demandés, puis libère ce qui ne sert qu'à les construire."""
+        for besoin in besoins:
+            getattr(self, besoin)
+        # Les transactions brutes ne sont jamais envoyées aux processus de rendu
+        if 'transactions' not in besoins:
+            self.__dict__.pop('transactions', None)
+        return self
+
+
+# --- CACHE DES GRAPHIQUES ---
+_empreinte_code = None
+
+
+def empreinte_code():
+    """Empreinte du code de rendu : modifier un graphique invalide les images en cache."""
+    global _empreinte_code
+    if _empreinte_code is None:
+        from commun import graphiques, profils, projection, quantiles, rfm, segmentation
+        h = hashlib.blake2b(digest_size=16)
+        modules = (graphiques, profils, projection, quantiles, rfm, segmentation)
+        for chemin in [module.__file__ for module in modules] + [__file__]:
+            with open(chemin, 'rb') as f:
+                h.update(f.read())
+        _empreinte_code = h.hexdigest()
+    return _empreinte_code
+
+
+def empreinte_graphique(donnees, nom):
+    """Empreinte des entrées déclarées par le graphique ``nom`` (colonnes, paramètres, code)."""
+    from commun.graphiques import GRAPHIQUES
+
+    entrees = GRAPHIQUES[nom][2]
+    h = hashlib.blake2b(nom.encode(), digest_size=16)
+    h.update(empreinte_code().encode())
+    for source, colonnes in sorted(entrees.items()):
+        for colonne in colonnes:
+            if source == 'parametres':
+                h.update(f'{colonne}={getattr(donnees, colonne)!r}'.encode())
+            else:
+                h.update(f'{source}.{colonne}={donnees.empreinte_colonne(source, colonne)}'.encode())
+    return h.hexdigest()
+
+
+def _chemin_cache(dossier_cache, nom, empreinte):
+    base, extension = os.path.splitext(nom)
+    return os.path.join(dossier_cache, f'{base}-{empreinte}{extension}')
+
+
+# --- PROCESSUS DE RENDU ---
+_donnees = None
+
+
+def _initialiser(donnees):
+    global _donnees
+    _donnees = donnees
+
+
+def _rendre_un(nom, dossier):
+    from commun.graphiques import GRAPHIQUES
+    debut = time.perf_counter()
+    GRAPHIQUES[nom][0](_donnees, os.path.join(dossier, nom))
+    return nom, time.perf_counter() - debut
+
+
+def rendre(noms=None, dossier='.', processus=None, donnees=None, dossier_cache=None, forcer=False):
+    """Génère les graphiques ``noms`` (tous par défaut) dans ``dossier``.
+
+    ``processus`` fixe la taille du pool (nombre de cœurs par défaut, 1 = dans le
+    processus courant). Les graphiques dont les entrées n'ont pas changé sont repris
+    de ``dossier_cache`` (``<dossier>/.cache/graphiques`` par défaut), sauf si ``forcer``.
+    Renvoie {nom: durée en secondes} des graphiques dessinés (0 pour ceux repris du cache).
+    """
+    from commun.graphiques import GRAPHIQUES
+
+    noms = list(GRAPHIQUES) if noms is None else list(noms)
+    inconnus = [nom for nom in noms if nom not in GRAPHIQUES]
+    if inconnus:
+        raise ValueError(f"Graphiques inconnus : {', '.join(inconnus)}")
+    if donnees is None:
+        donnees = Donnees()
+
+    # Sans fichier de transactions, les graphiques qui en dépendent sont ignorés
+    if not os.path.exists(donnees.chemin_transactions):
+        ignores = [nom for nom in noms if {'promotions', 'articles'} & set(GRAPHIQUES[nom][1])]
+        for nom in ignores:
+            print(f"Ignoré : {nom} ({donnees.chemin_transactions} introuvable)")
+        noms = [nom for nom in noms if nom not in ignores]
+
+    if dossier_cache is None:
+        dossier_cache = os.path.join(dossier, '.cache', 'graphiques')
+    os.makedirs(dossier, exist_ok=True)
+    os.makedirs(dossier_cache, exist_ok=True)
+
+    # Graphiques dont une image existe déjà pour les mêmes entrées : simple copie
+    durees = {}
+    empreintes = {nom: empreinte_graphique(donnees, nom) for nom in noms}
+    a_dessiner = []
+    for nom in noms:
+        en_cache = _chemin_cache(dossier_cache, nom, empreintes[nom])
+        if forcer or not os.path.exists(en_cache):
+            a_dessiner.append(nom)
+            continue
+        shutil.copyfile(en_cache, os.path.join(dossier, nom))
+        durees[nom] = 0.0
+
+    besoins = list(dict.fromkeys(b for nom in a_dessiner for b in GRAPHIQUES[nom][1]))
+    donnees.preparer(besoins)
+
+    if processus is None:
+        processus = os.cpu_count() or 1
+    processus = min(processus, len(a_dessiner))
+
+    dessines = []
+    if processus <= 1:
+        _initialiser(donnees)
+        dessines = [_rendre_un(nom, dossier) for nom in a_dessiner]
+    else:
+        with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser, initargs=(donnees,)) as pool:
+            futures = [pool.submit(_rendre_un, nom, dossier) for nom in a_dessiner]
+            dessines = [future.result() for future in as_completed(futures)]
+
+    for nom, duree in dessines:
+        shutil.copyfile(os.path.join(dossier, nom), _chemin_cache(dossier_cache, nom, empreintes[nom]))
+        durees[nom] = duree
+    return durees
+
+
+if __name__ == '__main__':
+    # Exemple : python -m commun.rendu --dossier GRAPHIQUE
+    parser = argparse.ArgumentParser(description="Génère tous les graphiques à partir d'un seul chargement des données.")
+    parser.add_argument('graphiques', nargs='*', help="noms des PNG à générer (tous par défaut)")
+    parser.add_argument('--clients', default='customers.csv')
+    parser.add_argument('--transactions', default='transactions.csv')
+    parser.add_argument('--dossier', default='.', help="dossier de sortie des PNG")
+    parser.add_argument('--processus', type=int, default=None, help="taille du pool (1 = sans pool)")
+    parser.add_argument('--forcer', action='store_true', help="redessine même les graphiques inchangés")
+    parser.add_argument('--nuage', choices=['auto', 'points', 'densite'], default='auto',
+                        help="rendu des nuages de points (densite = grille 2D, pour les grandes bases)")
+    parser.add_argument('--segmentation', choices=['complet', 'flux'], default='complet',
+                        help="ajustement K-Means (flux = mini-lots, pour les grandes bases)")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    durees = rendre(args.graphiques or None, args.dossier, args.processus,
+                    Donnees(args.clients, args.transactions, args.nuage, args.segmentation), forcer=args.forcer)
+    for nom, duree in sorted(durees.items()):
+        print(f"{nom:<45} {duree:6.2f} s" if duree else f"{nom:<45} (inchangé)")
+    n_dessines = sum(1 for duree in durees.values() if duree)
+    print(f"{n_dessines} graphiques dessinés, {len(durees) - n_dessines} inchangés, "
+          f"en {time.perf_counter() - debut:.1f} s", file=sys.stderr)
@@ -0,0 +1,230 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+
+from commun.quantiles import COMPRESSION, resumer_colonnes
+
+# --- SCORES RFM PAR QUINTILES ---
+# Un seul calcul des trois scores pour tous les scripts : chaque colonne est triée une
+# fois (argsort stable), le rang donne directement le quintile, sans pd.qcut.
+# Les scores sont stockés en int8 et la cellule RFM en un entier (111 à 555) : la
+# sélection d'un segment n'est qu'une comparaison d'entiers, sans chaîne de caractères.
+#
+# Cube RFM : effectifs, sommes et sommes des carrés du montant par cellule R x F x M
+# (x pays, x cluster...), construits en un passage. Une règle de segment ou une matrice
+# (heatmap) se calcule ensuite sur les cellules du cube, sans relire la table clients.
+
+noms_rfm = {'recency_days': 'Récence', 'n_orders': 'Fréquence', 'total_spent': 'Montant Total'}
+cols_rfm = list(noms_rfm.values())
+
+CELLULE_PERDUS = 111
+
+# (score, variable, inverse) : pour la récence, 5 = la plus petite valeur
+SCORES = [('R_Score', 'Récence', True), ('F_Score', 'Fréquence', False), ('M_Score', 'Montant Total', False)]
+
+
+def quintiles(valeurs, inverse=False):
+    """Quintile (1 à 5, int8) de chaque valeur, identique à
+    ``pd.qcut(s.rank(method='first'), 5, labels=[1, 2, 3, 4, 5])``.
+
+    Les ex-aequo sont départagés par ordre d'apparition. Avec ``inverse``, 5 = plus petite valeur.
+    """
+    valeurs = np.asarray(valeurs)
+    n = len(valeurs)
+    position = np.empty(n, dtype=np.int64)
+    position[np.argsort(valeurs, kind='stable')] = np.arange(n)
+
+    # Bornes de qcut sur les rangs 1..n : 1 + k (n - 1) / 5 ; un rang égal à une borne
+    # reste dans le quintile inférieur. En entiers : quintile = 1 + #{k : 5 p > k (n - 1)}
+    bornes = np.arange(1, 5, dtype=np.int64) * (n - 1)
+    score = 1 + np.searchsorted(bornes, 5 * position, side='left')
+    if inverse:
+        score = 6 - score
+    return score.astype(np.int8)
+
+
+def scorer_rfm(df):
+    """Ajoute R_Score, F_Score, M_Score (int8) et la cellule RFM_Code (ex. 543, int16).
+
+    ``df`` contient les colonnes de ``cols_rfm``, sans valeur manquante.
+    5 = meilleur : le plus récent, le plus fidèle, le plus dépensier.
+    """
+    df = df.copy()
+    for score, colonne, inverse in SCORES:
+        df[score] = quintiles(df[colonne].to_numpy(), inverse=inverse)
+    return ajouter_code_cellule(df)
+
+
+def ajouter_code_cellule(df):
+    df['RFM_Code'] = (df['R_Score'].astype(np.int16) * 100 + df['F_Score'] * 10 + df['M_Score']).astype(np.int16)
+    return df
+
+
+# --- MODE PARTITIONNÉ (APPROCHÉ) ---
+# Pour une base qui ne tient pas dans un seul DataFrame : chaque bloc (ou processus)
+# résume recency_days, n_orders et total_spent (ResumeQuantiles, fusionnables), les
+# résumés fusionnés donnent les bornes des quintiles (20/40/60/80 %), puis chaque bloc
+# est scoré indépendamment en comparant ses valeurs aux bornes.
+#
+# Écarts avec le classement exact (scorer_rfm) :
+# - tant qu'une variable a au plus LIMITE_EXACTE valeurs distinctes (récence en jours,
+#   nombre de commandes), les bornes sont exactes ; seuls les ex-aequo situés sur une
+#   borne diffèrent : ils sont tous placés dans le quintile inférieur au lieu d'être
+#   départagés par ordre d'apparition (une même valeur a toujours le même score, mais
+#   les quintiles d'une variable très discrète ne font plus exactement 20 %) ;
+# - au-delà (montants), la borne au quantile q est approchée : un centroïde du résumé
+#   couvre au plus 2 pi sqrt(q (1 - q)) / COMPRESSION du rang, deux après fusion de
+#   résumés. Au plus ~4 pi x 0.49 / 500 ~ 1.2 % des clients peuvent passer du mauvais côté
+#   d'une borne (COMPRESSION = 500) ; en pratique l'interpolation dans le centroïde
+#   donne un écart bien plus faible (~0.01 % mesuré sur 2 millions de montants). Un client mal placé ne change
+#   que d'un quintile.
+
+
+def _appliquer(fonction, blocs, processus, *args):
+    """``fonction(bloc, *args)`` sur chaque bloc, résultats dans l'ordre des blocs.
+
+    Au plus 2 x ``processus`` blocs sont en cours à la fois : la mémoire reste bornée.
+    """
+    if processus <= 1:
+        for bloc in blocs:
+            yield fonction(bloc, *args)
+        return
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        en_cours = deque()
+        for bloc in blocs:
+            en_cours.append(pool.submit(fonction, bloc, *args))
+            if len(en_cours) >= 2 * processus:
+                yield en_cours.popleft().result()
+        while en_cours:
+            yield en_cours.popleft().result()
+
+
+def _resumer_bloc(bloc, compression):
+    return resumer_colonnes([bloc], list(noms_rfm), compression)
+
+
+def bornes_rfm(blocs, processus=None, compression=COMPRESSION):
+    """Bornes des quintiles de chaque variable RFM {variable: 4 bornes}, à partir des
+    résumés de quantiles des ``blocs`` (colonnes recency_days, n_orders, total_spent)."""
+    processus = processus or os.cpu_count() or 1
+    resumes = None
+    for resumes_bloc in _appliquer(_resumer_bloc, blocs, processus, compression):
+        if resumes is None:
+            resumes = resumes_bloc
+        else:
+            for colonne, resume in resumes_bloc.items():
+                resumes[colonne].fusionner(resume)
+    return {noms_rfm[colonne]: np.asarray(resume.quantile(np.array([0.2, 0.4, 0.6, 0.8])))
+            for colonne, resume in resumes.items()}
+
+
+def _scorer_bloc(bloc, bornes):
+    df = bloc.rename(columns=noms_rfm).dropna(subset=cols_rfm)
+    for score, colonne, inverse in SCORES:
+        # Une valeur égale à une borne reste dans le quintile inférieur (comme pd.qcut)
+        quintile = 1 + np.searchsorted(bornes[colonne], df[colonne].to_numpy(), side='left')
+        df[score] = (6 - quintile if inverse else quintile).astype(np.int8)
+    return ajouter_code_cellule(df)
+
+
+def scorer_blocs(blocs, bornes, processus=None):
+    """Scores R/F/M et cellule RFM de chaque bloc, avec les bornes globales ``bornes``.
+
+    Générateur : les blocs scorés sont produits dans l'ordre, sans jamais réunir la base.
+    """
+    processus = processus or os.cpu_count() or 1
+    yield from _appliquer(_scorer_bloc, blocs, processus, bornes)
+
+
+def clients_perdus(df_rfm):
+    """Masque des clients "perdus" : cellule exacte 111."""
+    return df_rfm['RFM_Code'] == CELLULE_PERDUS
+
+
+def clients_a_risque(df_rfm):
+    """Masque des clients "à risque" : score R faible (1 ou 2) ET forte fidélité
+    historique (score F >= 4 OU score M >= 4)."""
+    return (df_rfm['R_Score'] <= 2) & ((df_rfm['F_Score'] >= 4) | (df_rfm['M_Score'] >= 4))
+
+
+def part_segment(cube, regle):
+    """Effectif et montant du segment ``regle`` (lus dans ``cube``), rapportés à toute la base."""
+    total, segment = cube.agreger(), cube.agreger(regle)
+    return {'effectif': int(segment['effectif']), 'montant': float(segment['montant']),
+            'total_clients': int(total['effectif']), 'total_ca': float(total['montant']),
+            'part_clients': segment['effectif'] / total['effectif'] * 100,
+            'part_ca': segment['montant'] / total['montant'] * 100}
+
+
+class CubeRFM:
+    """Cube 5 x 5 x 5 (R, F, M), éventuellement croisé avec d'autres ``dimensions``
+    (colonnes de ``df_rfm``, ex. pays ou cluster) : effectif, somme et somme des carrés
+    de ``valeur`` par cellule.
+
+    Les règles de segment (``clients_perdus``, ``clients_a_risque``...) s'appliquent
+    telles quelles au cube : ``grilles`` donne R_Score, F_Score, M_Score, RFM_Code et
+    chaque dimension sous forme de tableaux diffusables sur les cellules.
+    """
+
+    def __init__(self, df_rfm, dimensions=(), valeur='Montant Total'):
+        self.axes = ['R_Score', 'F_Score', 'M_Score'] + list(dimensions)
+        self.modalites = {score: np.arange(1, 6) for score in self.axes[:3]}
+
+        index = np.zeros(len(df_rfm), dtype=np.int64)
+        for axe in self.axes:
+            if axe in self.modalites:
+                codes = df_rfm[axe].to_numpy(dtype=np.int64) - 1
+            else:
+                codes, modalites = pd.factorize(df_rfm[axe], sort=True, use_na_sentinel=False)
+                self.modalites[axe] = np.asarray(modalites)
+            index = index * len(self.modalites[axe]) + codes
+
+        forme = tuple(len(self.modalites[axe]) for axe in self.axes)
+        taille = int(np.prod(forme))
+        valeurs = df_rfm[valeur].to_numpy(dtype=np.float64)
+        self.effectifs = np.bincount(index, minlength=taille).reshape(forme)
+        self.sommes = np.bincount(index, weights=valeurs, minlength=taille).reshape(forme)
+        self.carres = np.bincount(index, weights=valeurs * valeurs, minlength=taille).reshape(forme)
+
+        self.grilles = {}
+        for i, axe in enumerate(self.axes):
+            diffusion = [1] * len(forme)
+            diffusion[i] = forme[i]
+            self.grilles[axe] = self.modalites[axe].reshape(diffusion)
+        self.grilles['RFM_Code'] = (self.grilles['R_Score'] * 100 + self.grilles['F_Score'] * 10
+                                    + self.grilles['M_Score'])
+
+    def _masque(self, regle):
+        if regle is None:
+            return np.ones(self.effectifs.shape, dtype=bool)
+        return np.broadcast_to(np.asarray(regle(self.grilles)), self.effectifs.shape)
+
+    def agreger(self, regle=None):
+        """Effectif, montant, moyenne et écart-type des clients qui vérifient ``regle``
+        (tous les clients par défaut)."""
+        masque = self._masque(regle)
+        return _statistiques(self.effectifs[masque].sum(), self.sommes[masque].sum(), self.carres[masque].sum())
+
+    def tableau(self, lignes, colonnes, statistique='moyenne', regle=None):
+        """Matrice ``lignes`` x ``colonnes`` d'une statistique (effectif, montant, moyenne,
+        ecart_type), les autres axes étant sommés ; équivalent d'un pivot_table."""
+        masque = self._masque(regle)
+        autres = tuple(i for i, axe in enumerate(self.axes) if axe not in (lignes, colonnes))
+        tables = [np.where(masque, t, 0).sum(axis=autres) for t in (self.effectifs, self.sommes, self.carres)]
+        if self.axes.index(lignes) > self.axes.index(colonnes):
+            tables = [t.T for t in tables]
+        valeurs = _statistiques(*tables)[statistique]
+        return pd.DataFrame(valeurs,
+                            index=pd.Index(self.modalites[lignes], name=lignes),
+                            columns=pd.Index(self.modalites[colonnes], name=colonnes))
+
+
+def _statistiques(effectif, somme, carres):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moyenne = somme / effectif
+        variance = (carres - somme * moyenne) / (effectif - 1)  # écart-type corrigé, comme pandas
+    return {'effectif': effectif, 'montant': somme, 'moyenne': moyenne,
+            'ecart_type': np.sqrt(np.maximum(variance, 0))}
@@ -0,0 +1,172 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from commun.rfm import ajouter_code_cellule
+
+# --- RFM INCRÉMENTAL (NOUVELLES TRANSACTIONS) ---
+# L'état garde, pour chaque client, le jour de son dernier achat, son nombre de
+# commandes et son montant cumulé, ainsi que les bornes des quintiles et les scores.
+# Un lot de transactions ne met à jour que les clients qu'il contient (coût
+# proportionnel au lot) : leurs scores sont recalculés contre les bornes mémorisées,
+# seuls ceux qui franchissent une borne changent de score.
+#
+# La récence est repérée par le jour du dernier achat : quand la date de référence
+# avance, toutes les récences augmentent d'autant et le classement ne change pas.
+# Les bornes sont recalculées sur toute la base (reclassement complet) seulement quand
+# la part des clients sous une borne s'écarte de plus de ``tolerance`` de sa valeur au
+# dernier reclassement.
+#
+# Hypothèse : toutes les lignes d'une même facture arrivent dans le même lot.
+
+TOLERANCE = 0.02
+QUANTILES = np.array([0.2, 0.4, 0.6, 0.8])
+COLONNES_LOT = ['invoice_id', 'customer_id', 'invoice_date', 'quantity', 'unit_price']
+
+
+def _agreger_lot(df_lot):
+    # Par client : dernier jour d'achat, nombre de factures, montant du lot
+    jours = df_lot['invoice_date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    lot = pd.DataFrame({'customer_id': df_lot['customer_id'].to_numpy(np.int64), 'jour': jours,
+                        'invoice_id': df_lot['invoice_id'].to_numpy(), 'line_total': df_lot['line_total'].to_numpy()})
+    return lot.groupby('customer_id', sort=False).agg(jour=('jour', 'max'), commandes=('invoice_id', 'nunique'),
+                                                     montant=('line_total', 'sum'))
+
+
+class EtatRFM:
+    """Valeurs et scores RFM de chaque client, mis à jour lot par lot de transactions."""
+
+    def __init__(self, tolerance=TOLERANCE):
+        self.tolerance = tolerance
+        self.n = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.valeurs = np.empty((3, 0))                    # jour du dernier achat, commandes, montant
+        self.scores = np.empty((3, 0), dtype=np.int8)      # R, F, M
+        self.bornes = np.zeros((3, 4))
+        self.effectifs = np.zeros((3, 5), dtype=np.int64)  # clients par score (1 à 5)
+        self.parts_reference = np.zeros((3, 4))
+        self.jour_reference = 0
+        self.reclassements = 0
+        self._positions = {}
+
+    def _agrandir(self, n_total):
+        capacite = len(self.ids)
+        if n_total <= capacite:
+            return
+        capacite = max(n_total, 2 * capacite, 1024)
+        ids, valeurs, scores = self.ids, self.valeurs, self.scores
+        self.ids = np.zeros(capacite, dtype=np.int64)
+        self.valeurs = np.zeros((3, capacite))
+        self.scores = np.zeros((3, capacite), dtype=np.int8)
+        self.ids[:self.n], self.valeurs[:, :self.n], self.scores[:, :self.n] = \
+            ids[:self.n], valeurs[:, :self.n], scores[:, :self.n]
+
+    def _scorer(self, valeurs):
+        scores = np.empty(valeurs.shape, dtype=np.int8)
+        # Jour le plus récent = R le plus haut ; un jour égal à une borne a la récence la
+        # plus faible des deux quintiles, donc le meilleur score (comme scorer_blocs)
+        scores[0] = 1 + np.searchsorted(self.bornes[0], valeurs[0], side='right')
+        for i in (1, 2):
+            scores[i] = 1 + np.searchsorted(self.bornes[i], valeurs[i], side='left')
+        return scores
+
+    def _compter(self, scores):
+        return np.stack([np.bincount(s - 1, minlength=5) for s in scores]) if scores.shape[1] else 0
+
+    def _parts(self):
+        return np.cumsum(self.effectifs, axis=1)[:, :4] / max(self.n, 1)
+
+    def derive(self):
+        """Plus grand écart entre la part des clients sous une borne et sa valeur au dernier reclassement."""
+        return float(np.abs(self._parts() - self.parts_reference).max())
+
+    def reclasser(self):
+        """Recalcule les bornes sur toute la base, puis tous les scores."""
+        valeurs = self.valeurs[:, :self.n]
+        self.bornes = np.quantile(valeurs, QUANTILES, axis=1).T
+        self.scores[:, :self.n] = self._scorer(valeurs)
+        self.effectifs = self._compter(self.scores[:, :self.n])
+        self.parts_reference = self._parts()
+        self.reclassements += 1
+
+    def appliquer(self, df_lot):
+        """Intègre un lot de transactions (colonnes invoice_id, customer_id, invoice_date,
+        line_total) et renvoie le bilan de la mise à jour."""
+        if df_lot.empty:
+            # Rien à intégrer ; sur un état encore vide, il n'y aurait aucune borne à calculer
+            return {'lignes': 0, 'clients_touches': 0, 'nouveaux_clients': 0,
+                    'scores_modifies': 0, 'derive': 0.0, 'reclassement': False}
+        lot = _agreger_lot(df_lot)
+        ids = lot.index.to_numpy(np.int64)
+        positions = np.fromiter((self._positions.get(i, -1) for i in ids.tolist()), dtype=np.int64, count=len(ids))
+
+        # Nouveaux clients : ajoutés en fin de tableau
+        nouveaux = positions < 0
+        n_nouveaux = int(nouveaux.sum())
+        self._agrandir(self.n + n_nouveaux)
+        positions[nouveaux] = np.arange(self.n, self.n + n_nouveaux)
+        self.ids[positions[nouveaux]] = ids[nouveaux]
+        self._positions.update(zip(ids[nouveaux].tolist(), positions[nouveaux].tolist()))
+        self.n += n_nouveaux
+
+        anciens = self.scores[:, positions[~nouveaux]]
+        self.valeurs[0, positions] = np.maximum(self.valeurs[0, positions], lot['jour'].to_numpy())
+        self.valeurs[1, positions] += lot['commandes'].to_numpy()
+        self.valeurs[2, positions] += lot['montant'].to_numpy()
+        self.jour_reference = max(self.jour_reference, int(lot['jour'].max()) if len(lot) else 0)
+
+        bilan = {'lignes': len(df_lot), 'clients_touches': len(ids), 'nouveaux_clients': n_nouveaux,
+                 'scores_modifies': 0, 'derive': 0.0, 'reclassement': False}
+        if self.reclassements == 0:
+            self.reclasser()
+            bilan['reclassement'] = True
+            return bilan
+
+        # Seuls les clients du lot sont rescorés contre les bornes mémorisées
+        scores = self._scorer(self.valeurs[:, positions])
+        self.scores[:, positions] = scores
+        self.effectifs += self._compter(scores) - self._compter(anciens)
+        bilan['scores_modifies'] = int((scores[:, ~nouveaux] != anciens).any(axis=0).sum())
+
+        bilan['derive'] = self.derive()
+        if bilan['derive'] > self.tolerance:
+            self.reclasser()
+            bilan['reclassement'] = True
+        return bilan
+
+    def table(self):
+        """Table RFM courante (même colonnes que scorer_rfm, plus customer_id)."""
+        df = pd.DataFrame({
+            'customer_id': self.ids[:self.n],
+            'Récence': self.jour_reference - self.valeurs[0, :self.n],
+            'Fréquence': self.valeurs[1, :self.n],
+            'Montant Total': self.valeurs[2, :self.n],
+            'R_Score': self.scores[0, :self.n],
+            'F_Score': self.scores[1, :self.n],
+            'M_Score': self.scores[2, :self.n],
+        })
+        return ajouter_code_cellule(df)
+
+    def sauvegarder(self, dossier):
+        os.makedirs(dossier, exist_ok=True)
+        np.savez(os.path.join(dossier, 'etat_rfm.npz'), ids=self.ids[:self.n], valeurs=self.valeurs[:, :self.n],
+                 scores=self.scores[:, :self.n], bornes=self.bornes, effectifs=self.effectifs,
+                 parts_reference=self.parts_reference,
+                 meta=np.array([self.jour_reference, self.reclassements, self.tolerance]))
+
+    @classmethod
+    def charger(cls, dossier):
+        """État enregistré dans ``dossier``, ou None s'il n'existe pas."""
+        chemin = os.path.join(dossier, 'etat_rfm.npz')
+        if not os.path.exists(chemin):
+            return None
+        with np.load(chemin) as f:
+            jour_reference, reclassements, tolerance = f['meta']
+            etat = cls(float(tolerance))
+            etat.n = len(f['ids'])
+            etat.ids, etat.valeurs, etat.scores = f['ids'], f['valeurs'], f['scores']
+            etat.bornes, etat.effectifs, etat.parts_reference = f['bornes'], f['effectifs'], f['parts_reference']
+        etat.jour_reference, etat.reclassements = int(jour_reference), int(reclassements)
+        etat._positions = dict(zip(etat.ids.tolist(), range(etat.n)))
+        return etat
@@ -0,0 +1,111 @@
+import sys
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# --- SCHÉMA DE TYPES COMPACTS ---
+# Un seul endroit décrit le type de chaque colonne :
+#   - 'category' pour les textes répétés (pays, codes produits, factures) ;
+#   - entiers 32 bits pour les identifiants et quantités ('Int32' = entier acceptant les vides) ;
+#   - float32 quand la précision suffit (compteurs de jours ou de commandes, prix unitaires) ;
+#   - float64 pour les montants cumulés (sommes exactes au centime) ;
+#   - datetime64 pour les dates.
+
+schema_clients = {
+    'customer_id': 'int32',
+    'country': 'category',
+    'first_purchase': 'datetime64[ns]',
+    'last_purchase': 'datetime64[ns]',
+    'n_orders': 'float32',
+    'total_spent': 'float64',
+    'avg_basket': 'float64',
+    'recency_days': 'float32',
+    'tenure_days': 'float32',
+}
+
+schema_transactions = {
+    'invoice_id': 'category',
+    'customer_id': 'Int32',
+    'product_code': 'category',
+    'product_name': 'category',
+    'quantity': 'Int32',
+    'unit_price': 'float32',
+    'invoice_date': 'datetime64[ns]',
+    'country': 'category',
+}
+
+
+def colonnes_numeriques(schema):
+    """Colonnes du schéma lues comme des nombres (entiers ou décimaux)."""
+    return [col for col, t in schema.items() if t.lower().startswith(('int', 'float'))]
+
+
+def lire_csv(chemin, schema, colonnes=None, **options_csv):
+    """pd.read_csv avec les types du schéma appliqués dès la lecture (``colonnes`` limite la lecture).
+
+    Les dates sont converties après coup avec errors='coerce' (date invalide -> NaT).
+    """
+    if colonnes is not None:
+        options_csv['usecols'] = colonnes
+    dates = [col for col, t in schema.items() if t.startswith('datetime')]
+    dtype = {col: t for col, t in schema.items() if col not in dates and (colonnes is None or col in colonnes)}
+    df = pd.read_csv(chemin, dtype=dtype, **options_csv)
+    for col in dates:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def convertir(serie, type_cible):
+    """Convertit une colonne déjà chargée vers ``type_cible`` (valeurs invalides -> vide)."""
+    if type_cible.startswith('datetime'):
+        return pd.to_datetime(serie, errors='coerce')
+    if type_cible == 'category':
+        return serie.astype('category')
+    if type_cible.startswith('int') and serie.isna().any():
+        # Un entier non nullable ne peut pas contenir de vide
+        return pd.to_numeric(serie, errors='coerce').astype(type_cible.capitalize())
+    return pd.to_numeric(serie, errors='coerce').astype(type_cible)
+
+
+def appliquer_schema(df, schema):
+    """Renvoie ``df`` avec les colonnes présentes dans le schéma converties (une seule copie)."""
+    return df.assign(**{col: convertir(df[col], t) for col, t in schema.items()
+                        if col in df.columns and str(df[col].dtype) != t})
+
+
+def concatener_blocs(blocs):
+    """pd.concat qui conserve les colonnes 'category' même si les blocs n'ont pas les mêmes modalités."""
+    blocs = list(blocs)
+    if not blocs:
+        return pd.DataFrame()
+    categories = {col: union_categoricals([b[col] for b in blocs], ignore_order=True).categories
+                  for col in blocs[0].columns if isinstance(blocs[0][col].dtype, pd.CategoricalDtype)}
+    if categories:
+        blocs = [b.assign(**{col: b[col].cat.set_categories(cats) for col, cats in categories.items()})
+                 for b in blocs]
+    return pd.concat(blocs, ignore_index=True)
+
+
+def rapport_memoire(df_avant, df_apres):
+    """Mémoire occupée par colonne (octets) avant / après application du schéma."""
+    avant = df_avant.memory_usage(deep=True, index=False)
+    apres = df_apres.memory_usage(deep=True, index=False)
+    rapport = pd.DataFrame({
+        'type_avant': df_avant.dtypes.astype(str),
+        'type_apres': df_apres.dtypes.astype(str),
+        'octets_avant': avant,
+        'octets_apres': apres,
+    })
+    rapport.loc['TOTAL'] = ['', '', avant.sum(), apres.sum()]
+    rapport['reduction'] = (rapport['octets_avant'] / rapport['octets_apres']).round(1)
+    return rapport
+
+
+if __name__ == '__main__':
+    # Exemple : python -m commun.schema transactions.csv
+    chemin = sys.argv[1] if len(sys.argv) > 1 else 'transactions.csv'
+    df_brut = pd.read_csv(chemin)
+    schema = schema_transactions if 'invoice_id' in df_brut.columns else schema_clients
+    with pd.option_context('display.width', 200):
+        print(rapport_memoire(df_brut, appliquer_schema(df_brut, schema)))
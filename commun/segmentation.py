@@ -0,0 +1,225 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from commun.rfm import cols_rfm, noms_rfm
+
+# --- MODÈLE DE SEGMENTATION (K-MEANS SUR LES VARIABLES RFM) ---
+# Un seul modèle pour tous les graphiques : standardisation (moyennes, écarts-types),
+# centres K-Means et numérotation des clusters par montant moyen croissant
+# (0 = Occasionnels ... 3 = Champions). Il est ajusté une fois puis enregistré sous
+# .cache/, à côté du cache de la table clients, sous l'empreinte des données et des
+# paramètres : tant que les colonnes RFM ne changent pas, chaque script le recharge
+# (quelques tableaux numpy, sans sklearn) et tous les graphiques montrent les mêmes clusters.
+#
+# Mode en flux (bases de plusieurs millions de clients) : K-Means par mini-lots
+# (MiniBatchKMeans.partial_fit) alimenté bloc par bloc depuis le cache, sans jamais
+# réunir la base ; le modèle obtenu est le même objet, numéroté de la même façon.
+# Les centres de départ viennent d'un K-Means complet sur un échantillon uniforme de
+# toute la base (réservoir tiré pendant le passage de standardisation), qui leur donne
+# aussi leur poids initial : le résultat ne dépend plus de l'ordre du fichier (base triée
+# par récence ou par montant : même inertie, à moins de 1 % près, qu'une base mélangée).
+#
+# Attribution (assigner_clusters) : le modèle enregistré classe n'importe quel flux de
+# clients, bloc par bloc, sans réajustement (un produit matriciel par bloc).
+
+VERSION_MODELE = 1
+noms_clusters = {0: 'C0 (Occasionnels)', 1: 'C1 (Réguliers)', 2: 'C2 (Fidèles)', 3: 'C3 (Champions)'}
+N_CLUSTERS = 4
+PARAMETRES_KMEANS = {'n_clusters': N_CLUSTERS, 'random_state': 42, 'n_init': 10}
+TAILLE_LOT = 4096   # lignes par mise à jour du mode en flux
+EPOQUES = 2         # passages sur la base en mode en flux
+TAILLE_INITIALISATION = 10 * TAILLE_LOT  # lignes (échantillon) du K-Means complet qui initialise le flux
+
+
+class ModeleSegmentation:
+    """Standardisation + centres K-Means (dans l'espace standardisé), déjà renumérotés."""
+
+    def __init__(self, moyennes, ecarts, centres, empreinte=None):
+        self.moyennes = np.asarray(moyennes, dtype=np.float64)
+        self.ecarts = np.asarray(ecarts, dtype=np.float64)
+        self.centres = np.asarray(centres)
+        self.empreinte = empreinte
+
+    def standardiser(self, df):
+        """Variables RFM centrées réduites (identique à StandardScaler.transform)."""
+        X = df[cols_rfm].to_numpy(dtype=np.float64, copy=True)
+        X -= self.moyennes
+        X /= self.ecarts
+        return X
+
+    def predire(self, X_standardise):
+        """Cluster (0 à N_CLUSTERS - 1) du centre le plus proche de chaque ligne."""
+        X = np.asarray(X_standardise, dtype=self.centres.dtype)
+        # |x - c|² = |x|² - 2 x.c + |c|² ; |x|² ne change pas l'argmin
+        distances = (self.centres ** 2).sum(axis=1) - 2 * X @ self.centres.T
+        return distances.argmin(axis=1).astype(np.int8)
+
+    @classmethod
+    def ajuster(cls, df, empreinte=None, **parametres):
+        """Ajuste la standardisation et K-Means sur les colonnes RFM de ``df``, puis
+        numérote les clusters par 'Montant Total' moyen croissant."""
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
+
+        parametres = {**PARAMETRES_KMEANS, **parametres}
+        scaler = StandardScaler().fit(df[cols_rfm])
+        kmeans = KMeans(**parametres).fit(scaler.transform(df[cols_rfm]))
+
+        # Tri des clusters du plus petit montant moyen (0) au plus grand (3)
+        ordre = pd.Series(df['Montant Total'].to_numpy()).groupby(kmeans.labels_).mean().sort_values().index
+        return cls(scaler.mean_, scaler.scale_, kmeans.cluster_centers_[ordre], empreinte)
+
+    @classmethod
+    def ajuster_en_flux(cls, blocs, empreinte=None, epoques=EPOQUES, **parametres):
+        """Même modèle que ``ajuster``, calculé en flux : ``blocs()`` renvoie à chaque appel
+        un nouvel itérateur de DataFrames (colonnes RFM, sans valeur manquante).
+
+        Un passage pour la standardisation, ``epoques`` passages de mini-lots, puis un
+        passage pour numéroter les clusters par montant moyen.
+        """
+        flux = SegmentationEnFlux(**parametres)
+        for bloc in blocs():
+            flux.standardisation(bloc)
+        for _ in range(epoques):
+            for bloc in blocs():
+                flux.partial_fit(bloc)
+        return flux.modele(blocs(), empreinte)
+
+    def sauvegarder(self, chemin):
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temporaire = chemin + '.tmp.npz'
+        np.savez(temporaire, moyennes=self.moyennes, ecarts=self.ecarts, centres=self.centres)
+        os.replace(temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin, empreinte=None):
+        with np.load(chemin) as f:
+            return cls(f['moyennes'], f['ecarts'], f['centres'], empreinte)
+
+
+class SegmentationEnFlux:
+    """K-Means par mini-lots alimenté bloc par bloc (API de type partial_fit)."""
+
+    def __init__(self, taille_lot=TAILLE_LOT, **parametres):
+        from sklearn.preprocessing import StandardScaler
+
+        self.parametres = {**PARAMETRES_KMEANS, **parametres}
+        self.taille_lot = taille_lot
+        self.scaler = StandardScaler()
+        self.kmeans = None
+        # Réservoir : TAILLE_INITIALISATION lignes RFM brutes tirées uniformément dans tout
+        # le flux (les clés aléatoires les plus petites), avec leurs clés
+        self._alea = np.random.default_rng(self.parametres['random_state'])
+        self._reservoir = np.empty((0, len(cols_rfm)))
+        self._cles = np.empty(0)
+
+    def standardisation(self, bloc):
+        """Premier passage : moyennes et écarts-types, cumulés bloc par bloc, et réservoir
+        des lignes qui initialiseront les centres."""
+        valeurs = bloc[cols_rfm].to_numpy(np.float64)
+        self.scaler.partial_fit(valeurs)
+        reservoir = np.concatenate([self._reservoir, valeurs])
+        cles = np.concatenate([self._cles, self._alea.random(len(valeurs))])
+        if len(cles) > TAILLE_INITIALISATION:
+            gardees = np.argpartition(cles, TAILLE_INITIALISATION)[:TAILLE_INITIALISATION]
+            reservoir, cles = reservoir[gardees], cles[gardees]
+        self._reservoir, self._cles = reservoir, cles
+        return self
+
+    def partial_fit(self, bloc):
+        """Met à jour les centres avec un bloc, découpé en mini-lots de ``taille_lot`` lignes."""
+        X = self.scaler.transform(bloc[cols_rfm].to_numpy(np.float64))
+        if self.kmeans is None:
+            self._initialiser()
+        for debut in range(0, len(X), self.taille_lot):
+            self.kmeans.partial_fit(X[debut:debut + self.taille_lot])
+        return self
+
+    def _initialiser(self):
+        # partial_fit n'initialise les centres que sur un seul mini-lot : on part plutôt des
+        # centres d'un K-Means complet (n_init essais) sur le réservoir, standardisé avec la
+        # standardisation finale du premier passage. Un premier partial_fit sur ce même
+        # réservoir donne à chaque centre le poids de ses lignes : sans lui, le premier
+        # mini-lot du flux remplacerait entièrement les centres (compteurs à zéro).
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+
+        p = self.parametres
+        echantillon = self.scaler.transform(self._reservoir)
+        debut = KMeans(**p).fit(echantillon)
+        self.kmeans = MiniBatchKMeans(n_clusters=p['n_clusters'], init=debut.cluster_centers_, n_init=1,
+                                      random_state=p['random_state'], batch_size=self.taille_lot)
+        self.kmeans.partial_fit(echantillon)
+        self._reservoir, self._cles = None, None
+
+    def modele(self, blocs, empreinte=None):
+        """Modèle final : clusters numérotés par 'Montant Total' moyen croissant (un passage sur ``blocs``)."""
+        brut = ModeleSegmentation(self.scaler.mean_, self.scaler.scale_, self.kmeans.cluster_centers_)
+        n_clusters = len(brut.centres)
+        sommes, effectifs = np.zeros(n_clusters), np.zeros(n_clusters)
+        for bloc in blocs:
+            labels = brut.predire(brut.standardiser(bloc))
+            sommes += np.bincount(labels, weights=bloc['Montant Total'].to_numpy(np.float64), minlength=n_clusters)
+            effectifs += np.bincount(labels, minlength=n_clusters)
+        with np.errstate(invalid='ignore'):
+            ordre = np.argsort(sommes / effectifs, kind='stable')
+        return ModeleSegmentation(brut.moyennes, brut.ecarts, brut.centres[ordre], empreinte)
+
+
+def echantillon_stratifie(strates, taille, graine=42):
+    """Positions d'un échantillon d'environ ``taille`` lignes, tirées dans chaque strate
+    proportionnellement à son effectif (au moins une ligne par strate)."""
+    strates = np.asarray(strates)
+    n = len(strates)
+    if n <= taille:
+        return np.arange(n)
+    codes, effectifs = np.unique(strates, return_inverse=True, return_counts=True)[1:]
+    quotas = np.maximum(1, np.round(effectifs * taille / n)).astype(np.int64)
+
+    # Ordre aléatoire à l'intérieur de chaque strate, puis les ``quota`` premières lignes
+    ordre = np.lexsort((np.random.default_rng(graine).random(n), codes))
+    debuts = np.concatenate([[0], np.cumsum(effectifs)[:-1]])
+    rang = np.arange(n) - debuts[codes[ordre]]
+    return np.sort(ordre[rang < quotas[codes[ordre]]])
+
+
+def assigner_clusters(blocs, modele):
+    """Segment de chaque client d'un flux de blocs (colonnes recency_days, n_orders,
+    total_spent, et customer_id si présent), avec un modèle déjà ajusté.
+
+    Générateur de DataFrames (customer_id, Cluster, Nom_Cluster) ; une ligne dont une
+    variable RFM est vide ou invalide reçoit le cluster -1.
+    """
+    for bloc in blocs:
+        df_rfm = pd.DataFrame({nom: pd.to_numeric(bloc[col], errors='coerce') for col, nom in noms_rfm.items()})
+        valides = df_rfm.notna().all(axis=1).to_numpy()
+        clusters = np.full(len(bloc), -1, dtype=np.int8)
+        clusters[valides] = modele.predire(modele.standardiser(df_rfm[valides]))
+
+        sortie = bloc[['customer_id']].copy() if 'customer_id' in bloc.columns else pd.DataFrame(index=bloc.index)
+        sortie['Cluster'] = clusters
+        sortie['Nom_Cluster'] = sortie['Cluster'].map(noms_clusters)
+        yield sortie
+
+
+def empreinte_segmentation(empreintes_colonnes, **parametres):
+    """Empreinte du modèle : contenu des colonnes RFM sources + paramètres de K-Means."""
+    h = hashlib.blake2b(f'v{VERSION_MODELE}'.encode(), digest_size=16)
+    for colonne in empreintes_colonnes:
+        h.update(colonne.encode())
+    for cle, valeur in sorted({**PARAMETRES_KMEANS, **parametres}.items()):
+        h.update(f'{cle}={valeur!r}'.encode())
+    return h.hexdigest()
+
+
+def modele_segmentation(empreinte, dossier_cache, ajuster):
+    """Modèle enregistré sous ``empreinte`` dans ``dossier_cache`` ; s'il manque, ``ajuster(empreinte)``
+    le calcule et il est enregistré."""
+    chemin = os.path.join(dossier_cache, f'segmentation-{empreinte}.npz')
+    if os.path.exists(chemin):
+        return ModeleSegmentation.charger(chemin, empreinte)
+    modele = ajuster(empreinte)
+    modele.sauvegarder(chemin)
+    return modele
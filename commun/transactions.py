@@ -0,0 +1,46 @@
+from commun.schema import lire_csv, schema_transactions
+
+DECIMALES_PRIX = 4
+
+
+def charger_transactions(chemin='transactions.csv', colonnes=None):
+    """Charge transactions.csv avec les types compacts du schéma.
+
+    Les lignes sans client ou sans date sont retirées, ``customer_id`` devient un int32
+    et ``line_total`` (quantité x prix unitaire) est ajouté s'il est absent du fichier.
+    """
+    df_trans = lire_csv(chemin, schema_transactions, colonnes)
+
+    subset = [col for col in ['customer_id', 'invoice_date'] if col in df_trans.columns]
+    df_trans = df_trans.dropna(subset=subset)
+    if 'customer_id' in df_trans.columns:
+        df_trans['customer_id'] = df_trans['customer_id'].astype('int32')
+
+    # Montant de chaque ligne, calculé en float64 pour que les sommes restent exactes au centime.
+    # Le prix est stocké en float32 : on l'arrondit à 4 décimales pour retrouver sa valeur
+    # exacte (ex. 0.85 et non 0.8500000238) avant la multiplication.
+    if 'line_total' not in df_trans.columns and {'quantity', 'unit_price'} <= set(df_trans.columns):
+        prix = df_trans['unit_price'].astype('float64').round(DECIMALES_PRIX)
+        df_trans['line_total'] = df_trans['quantity'].astype('float64') * prix
+    return df_trans
+
+
+# --- TABLE DES FACTURES (UNE LIGNE PAR FACTURE) ---
+# Fréquence, délais entre achats, valeur de la dernière commande : ces calculs se font à
+# la facture, pas à la ligne d'article. La table des factures, 5 à 20 fois plus petite que
+# les transactions, est construite une fois par fichier et gardée dans le cache
+# (commun.cache.charger_factures_cache).
+
+def construire_factures(df_trans):
+    """Une ligne par facture : customer_id, invoice_id, invoice_date (date de la première
+    ligne), invoice_total (somme des line_total), n_items (quantités) et n_lines (lignes).
+
+    Triée par client puis par date (à date égale, dans l'ordre d'apparition des factures).
+    """
+    factures = df_trans.groupby(['customer_id', 'invoice_id'], observed=True, sort=False).agg(
+        invoice_date=('invoice_date', 'first'),
+        invoice_total=('line_total', 'sum'),
+        n_items=('quantity', 'sum'),
+        n_lines=('invoice_date', 'size'),
+    ).reset_index().astype({'n_lines': 'int32'})
+    return factures.sort_values(['customer_id', 'invoice_date'], kind='stable', ignore_index=True)
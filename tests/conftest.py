@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les tests importent commun comme les scripts des TP (dossier parent dans sys.path)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
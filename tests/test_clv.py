@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from commun.clv import table_modele, table_modele_snapshots
+from commun.transactions import charger_transactions, construire_factures
+
+
+def _transactions(chemin, snapshots, mois, n_factures=600, graine=0):
+    # Factures de plusieurs lignes (produits répétés, pays parfois vide ou différent d'une
+    # ligne à l'autre), plus une facture datée de la fin de la période cible de chaque
+    # snapshot : table_modele sur les transactions tronquées à cette date a ce snapshot.
+    rng = np.random.default_rng(graine)
+    debut = pd.Timestamp('2010-01-01')
+    dates = debut + pd.to_timedelta(rng.integers(0, 700 * 24, n_factures), unit='h')
+    fins = [pd.Timestamp(s) + pd.DateOffset(months=mois) for s in snapshots]
+    dates = np.concatenate([dates.to_numpy(), np.array(fins, dtype='datetime64[ns]')])
+    clients = rng.integers(10000, 10080, len(dates))
+
+    lignes = []
+    for facture, (date, client) in enumerate(zip(dates, clients)):
+        for _ in range(rng.integers(1, 5)):
+            lignes.append({'invoice_id': 500000 + facture, 'customer_id': float(client),
+                           'product_code': f'P{rng.integers(0, 40)}', 'product_name': 'X',
+                           'quantity': int(rng.integers(1, 12)), 'unit_price': round(rng.uniform(0.5, 9), 2),
+                           'invoice_date': pd.Timestamp(date),
+                           'country': rng.choice(['France', 'Germany', None], p=[0.6, 0.3, 0.1])})
+    pd.DataFrame(lignes).sample(frac=1, random_state=graine).to_csv(chemin, index=False)
+    return charger_transactions(chemin)
+
+
+@pytest.mark.parametrize('mois', [12, 6])
+@pytest.mark.parametrize('avec_factures', [False, True])
+def test_snapshots_identiques_a_table_modele(tmp_path, mois, avec_factures):
+    snapshots = [pd.Timestamp('2010-03-15'), pd.Timestamp('2010-06-15 12:00'), pd.Timestamp('2010-09-30')]
+    df_trans = _transactions(tmp_path / 'transactions.csv', snapshots, mois)
+    factures = construire_factures(df_trans) if avec_factures else None
+
+    longue = table_modele_snapshots(df_trans, snapshots, mois, factures)
+
+    assert longue['snapshot_date'].is_monotonic_increasing
+    for snapshot in snapshots:
+        fin = snapshot + pd.DateOffset(months=mois)
+        assert fin - pd.DateOffset(months=mois) == snapshot  # pas de fin de mois raccourcie
+        attendu = table_modele(df_trans[df_trans['invoice_date'] <= fin], mois)
+        obtenu = longue[longue['snapshot_date'] == snapshot].drop(columns='snapshot_date').reset_index(drop=True)
+        assert len(obtenu) > 0
+        pd.testing.assert_frame_equal(obtenu, attendu, check_exact=False, rtol=1e-12)
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from commun.doublons import dedoublonner_csv, iterer_sans_doublons
+
+
+def _ecrire_csv(chemin, n=500, graine=0):
+    # Petite table avec des doublons exacts et des doublons d'écriture numérique (5 / 5.0)
+    rng = np.random.default_rng(graine)
+    df = pd.DataFrame({'customer_id': rng.integers(0, 60, n).astype(str),
+                       'country': rng.choice(['France', 'Germany', 'Unspecified'], n),
+                       'n_orders': rng.integers(1, 4, n).astype(str)})
+    reecrits = rng.random(n) < 0.3
+    df.loc[reecrits, 'n_orders'] = df.loc[reecrits, 'n_orders'] + '.0'
+    df.loc[rng.random(n) < 0.05, 'n_orders'] = 'inconnu'
+    df.to_csv(chemin, index=False)
+
+
+def _attendu(chemin, numeriques):
+    # drop_duplicates sur les valeurs : nombres comparés par valeur, autres textes tels quels
+    df = pd.read_csv(chemin, dtype=str)
+    for col in numeriques:
+        valeurs = pd.to_numeric(df[col], errors='coerce')
+        df[col] = valeurs.astype(object).where(valeurs.notna(), df[col])
+    return df.drop_duplicates()
+
+
+@pytest.mark.parametrize('budget_memoire', [10 ** 9, 0], ids=['memoire', 'disque'])
+def test_identique_a_drop_duplicates(tmp_path, budget_memoire):
+    chemin = tmp_path / 'clients.csv'
+    _ecrire_csv(chemin)
+    attendu = _attendu(chemin, ['customer_id', 'n_orders'])
+
+    bilan = {}
+    blocs = iterer_sans_doublons(chemin, taille_bloc=64, budget_memoire=budget_memoire, n_partitions=4,
+                                 dossier_travail=tmp_path, bilan=bilan, numeriques=['customer_id', 'n_orders'],
+                                 dtype=str)
+    obtenu = pd.concat(list(blocs))
+
+    assert obtenu.index.tolist() == attendu.index.tolist()
+    assert bilan['doublons'] == 500 - len(attendu)
+    assert bilan['deverse_sur_disque'] == (budget_memoire == 0)
+    # Partitions et masque sur disque supprimés à la fin de la lecture
+    assert not [nom for nom in os.listdir(tmp_path) if nom.startswith('doublons_')]
+
+
+def test_dedoublonner_csv_deverse(tmp_path):
+    chemin, sortie = tmp_path / 'clients.csv', tmp_path / 'sortie.csv'
+    _ecrire_csv(chemin, graine=1)
+    attendu = _attendu(chemin, ['customer_id', 'n_orders'])
+
+    bilan = dedoublonner_csv(chemin, sortie, taille_bloc=50, budget_memoire=0, n_partitions=8,
+                             dossier_travail=tmp_path, numeriques=['customer_id', 'n_orders'])
+
+    assert bilan['deverse_sur_disque']
+    # Les lignes gardées sont écrites telles quelles (texte d'origine)
+    brut = pd.read_csv(chemin, dtype=str)
+    pd.testing.assert_frame_equal(pd.read_csv(sortie, dtype=str), brut.loc[attendu.index].reset_index(drop=True))
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import commun.incremental as incremental
+from commun.incremental import nettoyer_clients_incremental
+
+
+def _lignes_clients(n=400, graine=0):
+    # Lignes CSV (en-tête compris) au format de customers.csv, avec doublons et lignes rejetées
+    rng = np.random.default_rng(graine)
+    premiers = pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 300, n), unit='D')
+    df = pd.DataFrame({
+        'customer_id': rng.integers(10000, 10150, n),
+        'country': rng.choice(['France', 'Germany', 'Unspecified'], n, p=[0.5, 0.4, 0.1]),
+        'first_purchase': premiers.strftime('%Y-%m-%d'),
+        'last_purchase': (premiers + pd.to_timedelta(rng.integers(-20, 200, n), unit='D')).strftime('%Y-%m-%d'),
+        'n_orders': rng.integers(1, 4, n).astype(float),
+        'total_spent': rng.integers(50, 60, n).astype(float),
+        'avg_basket': rng.integers(20, 70, n).astype(float),
+        'recency_days': 100.0,
+        'tenure_days': 300.0,
+    })
+    df = pd.concat([df, df.iloc[rng.integers(0, n, n // 5)]]).sample(frac=1, random_state=graine)
+    return df.to_csv(index=False).encode('utf-8').splitlines(keepends=True)
+
+
+def _nettoyer(dossier, nom):
+    return nettoyer_clients_incremental(os.path.join(dossier, 'clients.csv'), os.path.join(dossier, nom + '.csv'),
+                                        chemin_rejets=os.path.join(dossier, nom + '_rejets.csv'), taille_bloc=25)
+
+
+def _contenu(dossier, nom):
+    return [open(os.path.join(dossier, nom + fin), 'rb').read() for fin in ('.csv', '_rejets.csv')]
+
+
+def test_ajouts_identiques_a_un_passage_complet(tmp_path):
+    lignes = _lignes_clients()
+    with open(tmp_path / 'clients.csv', 'wb') as f:
+        f.writelines(lignes[:150])
+    _nettoyer(tmp_path, 'sortie')
+    for debut, fin in ((150, 300), (300, 301), (301, len(lignes))):
+        with open(tmp_path / 'clients.csv', 'ab') as f:
+            f.writelines(lignes[debut:fin])
+        bilan = _nettoyer(tmp_path, 'sortie')
+        assert bilan['mode'] == 'incremental'
+    # Lignes déjà vues rajoutées telles quelles : toutes des doublons
+    with open(tmp_path / 'clients.csv', 'ab') as f:
+        f.writelines(lignes[1:50])
+    assert _nettoyer(tmp_path, 'sortie')['doublons'] == 49
+
+    assert _nettoyer(tmp_path, 'reference')['mode'] == 'complet'
+    assert _contenu(tmp_path, 'sortie') == _contenu(tmp_path, 'reference')
+
+
+@pytest.mark.parametrize('panne', ['bloc', 'etat'])
+def test_reprise_apres_arret_brutal(tmp_path, monkeypatch, panne):
+    lignes = _lignes_clients(graine=1)
+    with open(tmp_path / 'clients.csv', 'wb') as f:
+        f.writelines(lignes[:100])
+    _nettoyer(tmp_path, 'sortie')
+    with open(tmp_path / 'clients.csv', 'ab') as f:
+        f.writelines(lignes[100:])
+
+    if panne == 'bloc':
+        # Arrêt au milieu du passage : des blocs sont déjà ajoutés aux sorties
+        separer = incremental.separer_clients
+        appels = []
+
+        def separer_puis_arret(*args):
+            appels.append(1)
+            if len(appels) == 5:
+                raise KeyboardInterrupt
+            return separer(*args)
+
+        monkeypatch.setattr(incremental, 'separer_clients', separer_puis_arret)
+    else:
+        # Arrêt juste avant la validation : sorties et runs écrits, etat.json inchangé
+        ecrire = incremental._ecrire_atomique
+
+        def ecrire_sauf_etat(chemin, contenu):
+            if chemin.endswith('etat.json'):
+                raise KeyboardInterrupt
+            return ecrire(chemin, contenu)
+
+        monkeypatch.setattr(incremental, '_ecrire_atomique', ecrire_sauf_etat)
+
+    with pytest.raises(KeyboardInterrupt):
+        _nettoyer(tmp_path, 'sortie')
+    monkeypatch.undo()
+
+    bilan = _nettoyer(tmp_path, 'sortie')
+    assert bilan['mode'] == 'incremental'
+    assert bilan['lignes_nouvelles'] == len(lignes) - 100
+
+    _nettoyer(tmp_path, 'reference')
+    assert _contenu(tmp_path, 'sortie') == _contenu(tmp_path, 'reference')
+    # Runs du passage interrompu purgés : seuls les runs cités par l'état restent
+    etat = incremental._lire_etat(str(tmp_path / 'sortie.etat'))
+    assert sorted(nom for nom in os.listdir(tmp_path / 'sortie.etat') if nom.startswith('empreintes_')) \
+        == sorted(etat['runs'])
+
+
+def test_fichier_reecrit_retraite_en_entier(tmp_path):
+    lignes = _lignes_clients(graine=2)
+    with open(tmp_path / 'clients.csv', 'wb') as f:
+        f.writelines(lignes)
+    _nettoyer(tmp_path, 'sortie')
+    with open(tmp_path / 'clients.csv', 'wb') as f:
+        f.writelines(lignes[:1] + lignes[200:])
+
+    assert _nettoyer(tmp_path, 'sortie')['mode'] == 'complet'
+    _nettoyer(tmp_path, 'reference')
+    assert _contenu(tmp_path, 'sortie') == _contenu(tmp_path, 'reference')
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from commun.quantiles import LIMITE_EXACTE, ResumeQuantiles, verifier_fusion
+
+
+def _resume(valeurs):
+    return ResumeQuantiles().ajouter(valeurs)
+
+
+def test_fusion_exacte_independante_de_l_ordre():
+    rng = np.random.default_rng(0)
+    a, b = rng.integers(0, 300, 5000), rng.integers(100, 500, 300)
+    ab, ba = _resume(a).fusionner(_resume(b)), _resume(b).fusionner(_resume(a))
+
+    assert ab.exact and ba.exact
+    np.testing.assert_array_equal(ab.moyennes, ba.moyennes)
+    np.testing.assert_array_equal(ab.poids, ba.poids)
+    q = [0, 0.1, 0.5, 0.95, 1]
+    np.testing.assert_allclose(ab.quantile(q), np.quantile(np.concatenate([a, b]), q))
+
+
+@pytest.mark.parametrize('coupure', [10, LIMITE_EXACTE // 2, 25_000])
+def test_fusion_approchee_independante_de_l_ordre(coupure):
+    valeurs = np.random.default_rng(1).lognormal(3, 1, 50_000)
+    ab, ba, exacts = verifier_fusion(valeurs, coupure)
+
+    np.testing.assert_array_equal(ab, ba)
+    np.testing.assert_allclose(ab, exacts, rtol=0.02)
+
+
+def test_fusion_avec_un_resume_approche_n_est_plus_exacte():
+    rng = np.random.default_rng(2)
+    petits, grands = rng.integers(0, 10, 100), rng.normal(size=2 * LIMITE_EXACTE)
+    assert _resume(petits).exact and not _resume(grands).exact
+
+    ab, ba = _resume(petits).fusionner(_resume(grands)), _resume(grands).fusionner(_resume(petits))
+    assert not ab.exact and not ba.exact
+    np.testing.assert_array_equal(ab.quantile([0.5, 0.95]), ba.quantile([0.5, 0.95]))
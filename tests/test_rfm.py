@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from commun.rfm import quintiles
+
+
+def _qcut(valeurs, labels):
+    return pd.qcut(pd.Series(valeurs).rank(method='first'), 5, labels=labels).astype(int).to_numpy()
+
+
+@pytest.mark.parametrize('n', [5, 6, 7, 9, 10, 11, 13, 101, 1000, 4097])
+@pytest.mark.parametrize('tirage', ['discret', 'continu'])
+def test_quintiles_identiques_a_qcut_rank_first(n, tirage):
+    rng = np.random.default_rng(n)
+    # Beaucoup d'ex aequo (nombre de commandes) ou aucun (montants)
+    valeurs = rng.integers(1, 6, n) if tirage == 'discret' else rng.lognormal(5, 1, n)
+
+    scores = quintiles(valeurs)
+    assert scores.dtype == np.int8
+    np.testing.assert_array_equal(scores, _qcut(valeurs, [1, 2, 3, 4, 5]))
+    np.testing.assert_array_equal(quintiles(valeurs, inverse=True), _qcut(valeurs, [5, 4, 3, 2, 1]))